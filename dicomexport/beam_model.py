@@ -1,12 +1,34 @@
+import functools
 import logging
+import math
 import numpy as np
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
+# conversion factor from 1 sigma to FWHM of a gaussian, 2 * sqrt(2 ln 2)
+_FWHM_FACTOR = 2.0 * math.sqrt(2.0 * math.log(2.0))
+
+
 def get_fwhm(sigma):
-    return sigma * 2.0 * np.sqrt(2.0 * np.log(2.0))
+    return sigma * _FWHM_FACTOR
+
+
+@functools.lru_cache(maxsize=8)
+def _read_csv(fn: str, mtime_ns: int) -> np.ndarray:
+    """
+    Read the numeric rows of a beam model CSV file, lines starting with '#' are skipped.
+    Cached by path and modification time, the returned array is read-only since it is shared.
+    """
+    try:
+        # loadtxt uses a C parser, but requires all rows to have the same number of columns
+        data = np.loadtxt(fn, delimiter=",", comments='#', ndmin=2)
+    except ValueError:
+        logger.debug("Irregular rows in %s, skipping invalid lines.", fn)
+        data = np.genfromtxt(fn, delimiter=",", invalid_raise=False, comments='#')
+    data.setflags(write=False)
+    return data
 
 
 class BeamModel():
@@ -36,45 +58,95 @@ class BeamModel():
 
         TODO: get rid of scipy dependency
         """
-        data = np.genfromtxt(fn, delimiter=",", invalid_raise=False, comments='#')
+        fn = Path(fn)
+        data = _read_csv(str(fn.resolve()), fn.stat().st_mtime_ns)
 
         # resolve by nominal energy
         if nominal:
-            energy = data[:, 0]  # first column holds nominal energy
+            self._energy = data[:, 0]  # first column holds nominal energy
         else:
-            energy = data[:, 1]  # second column holds measured energy at the given beam_model position
-
-        k = 'cubic'
+            self._energy = data[:, 1]  # second column holds measured energy at the given beam_model position
 
         cols = len(data[0])
         logger.debug("Number of columns in beam model: %i", cols)
 
-        self.has_divergence = False
+        # the interpolators below are only fitted when first used
+        self._n_interp = 0
+        if cols in (6, 10):
+            self._n_interp = cols
+        else:
+            logger.error("invalid column count")
+
+        self.has_divergence = cols == 10
+        if self.has_divergence:
+            logger.debug("Beam model has divergence data")
+
+        self.data = data
+        self.beam_model_position = beam_model_position  # position of the beam model in mm
 
+    def _interpolate(self, col: int):
+        """Fit a cubic interpolator of the given data column as a function of energy."""
+        if col >= self._n_interp:
+            raise AttributeError(f"beam model has no interpolation data in column {col + 1}")
         try:
             from scipy.interpolate import interp1d
         except ImportError:
             logger.error("scipy is not installed, cannot interpolate beam model.")
             logger.error("Please install pymchelper[dicom] or pymchelper[all] to us this feature.")
-            return
+            raise
+        return interp1d(self._energy, self.data[:, col], kind='cubic')
 
-        if cols in (6, 10):
-            self.f_en = interp1d(energy, data[:, 0], kind=k)  # nominal energy [MeV]
-            self.f_e = interp1d(energy, data[:, 1], kind=k)  # measured energy [MeV]
-            self.f_espread = interp1d(energy, data[:, 2], kind=k)  # energy spread 1 sigma [% of measured energy]
-            self.f_ppmu = interp1d(energy, data[:, 3], kind=k)  # 1e6 protons per MU  [1e6/MU]
-            self.f_sx = interp1d(energy, data[:, 4], kind=k)  # 1 sigma x [mm]
-            self.f_sy = interp1d(energy, data[:, 5], kind=k)  # 1 sigma y [mm]
-        else:
-            logger.error("invalid column count")
+    @functools.cached_property
+    def f_en(self):
+        return self._interpolate(0)  # nominal energy [MeV]
 
-        if cols == 10:
-            logger.debug("Beam model has divergence data")
-            self.has_divergence = True
-            self.f_divx = interp1d(energy, data[:, 6], kind=k)  # div x [rad]
-            self.f_divy = interp1d(energy, data[:, 7], kind=k)  # div y [rad]
-            self.f_covx = interp1d(energy, data[:, 8], kind=k)  # cov (x, x') [mm]
-            self.f_covy = interp1d(energy, data[:, 9], kind=k)  # cov (y, y') [mm]
+    @functools.cached_property
+    def f_e(self):
+        return self._interpolate(1)  # measured energy [MeV]
 
-        self.data = data
-        self.beam_model_position = beam_model_position  # position of the beam model in mm
+    @functools.cached_property
+    def f_espread(self):
+        return self._interpolate(2)  # energy spread 1 sigma [% of measured energy]
+
+    @functools.cached_property
+    def f_ppmu(self):
+        return self._interpolate(3)  # 1e6 protons per MU  [1e6/MU]
+
+    @functools.cached_property
+    def f_sx(self):
+        return self._interpolate(4)  # 1 sigma x [mm]
+
+    @functools.cached_property
+    def f_sy(self):
+        return self._interpolate(5)  # 1 sigma y [mm]
+
+    @functools.cached_property
+    def f_divx(self):
+        return self._interpolate(6)  # div x [rad]
+
+    @functools.cached_property
+    def f_divy(self):
+        return self._interpolate(7)  # div y [rad]
+
+    @functools.cached_property
+    def f_covx(self):
+        return self._interpolate(8)  # cov (x, x') [mm]
+
+    @functools.cached_property
+    def f_covy(self):
+        return self._interpolate(9)  # cov (y, y') [mm]
+
+
+def load_beam_model(fn: Path, nominal=True, beam_model_position=500.0) -> BeamModel:
+    """
+    Return the BeamModel for a CSV file, reusing the model built earlier for the same file and settings.
+
+    The model is shared between callers and must not be modified.
+    """
+    fn = Path(fn).resolve()
+    return _load_beam_model(fn, fn.stat().st_mtime_ns, nominal, beam_model_position)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_beam_model(fn: Path, mtime_ns: int, nominal: bool, beam_model_position: float) -> BeamModel:
+    return BeamModel(fn, nominal=nominal, beam_model_position=beam_model_position)
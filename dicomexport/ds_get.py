@@ -3,10 +3,15 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Callable, Iterable, TypeVar, Any
 
+import numpy as np
+from pydicom.datadict import tag_for_keyword
 from pydicom.dataset import Dataset
 
 T = TypeVar("T")
 
+# keyword -> tag number, resolved once per keyword (None for keywords not in the DICOM dictionary)
+_TAG_CACHE: dict[str, int | None] = {}
+
 
 class DicomAttributeMissingError(ValueError):
     pass
@@ -16,13 +21,29 @@ class DicomAttributeInvalidError(ValueError):
     pass
 
 
-def req(ds: Dataset, keyword: str, *, cast: Callable[[Any], T] | None = None,
-        n: int | None = None, file: Path | None = None) -> T | Any:
-    """
-    Get a REQUIRED DICOM attribute by *keyword*. Raise clear error if missing
-    or malformed. Optionally check sequence length (n).
-    """
-    val = getattr(ds, keyword, None)
+def _tag(keyword: str) -> int | None:
+    """Resolve *keyword* to its tag number, cached per keyword."""
+    try:
+        return _TAG_CACHE[keyword]
+    except KeyError:
+        return _TAG_CACHE.setdefault(keyword, tag_for_keyword(keyword))
+
+
+def _lookup(ds: Dataset, keyword: str, tag: int | None) -> Any:
+    """Look up an attribute by its tag number, falling back to attribute access for unknown keywords."""
+    if tag is None:
+        return getattr(ds, keyword, None)
+    elem = ds.get(tag)
+    return None if elem is None else elem.value
+
+
+def _get_value(ds: Dataset, keyword: str) -> Any:
+    """Look up *keyword* by its cached tag number, falling back to attribute access."""
+    return _lookup(ds, keyword, _tag(keyword))
+
+
+def _required(val: Any, keyword: str, cast: Callable[[Any], T] | None,
+              n: int | None, file: Path | None) -> T | Any:
     if val is None:
         where = f" in {file.name}" if file else ""
         raise DicomAttributeMissingError(f"Missing required DICOM attribute '{keyword}'{where}.")
@@ -34,12 +55,7 @@ def req(ds: Dataset, keyword: str, *, cast: Callable[[Any], T] | None = None,
     return cast(val) if cast else val
 
 
-def opt(ds: Dataset, keyword: str, default: T, *,
-        cast: Callable[[Any], T] | None = None, n: int | None = None) -> T:
-    """
-    Get an OPTIONAL DICOM attribute; return default if missing OR cast/length fails.
-    """
-    val = getattr(ds, keyword, None)
+def _optional(val: Any, default: T, cast: Callable[[Any], T] | None, n: int | None) -> T:
     if val is None:
         return default
     if n is not None and hasattr(val, "__len__") and len(val) != n:
@@ -51,6 +67,48 @@ def opt(ds: Dataset, keyword: str, default: T, *,
     except Exception:
         return default
 
+
+def req(ds: Dataset, keyword: str, *, cast: Callable[[Any], T] | None = None,
+        n: int | None = None, file: Path | None = None) -> T | Any:
+    """
+    Get a REQUIRED DICOM attribute by *keyword*. Raise clear error if missing
+    or malformed. Optionally check sequence length (n).
+    """
+    return _required(_get_value(ds, keyword), keyword, cast, n, file)
+
+
+def opt(ds: Dataset, keyword: str, default: T, *,
+        cast: Callable[[Any], T] | None = None, n: int | None = None) -> T:
+    """
+    Get an OPTIONAL DICOM attribute; return default if missing OR cast/length fails.
+    """
+    return _optional(_get_value(ds, keyword), default, cast, n)
+
+
+def req_factory(keyword: str, *, cast: Callable[[Any], T] | None = None,
+                n: int | None = None) -> Callable[..., T | Any]:
+    """
+    Return req() specialised for *keyword*, called as getter(ds, file=None).
+    Tag number, cast and length are bound once, for attributes read from many datasets.
+    """
+    tag = _tag(keyword)
+
+    def getter(ds: Dataset, file: Path | None = None) -> T | Any:
+        return _required(_lookup(ds, keyword, tag), keyword, cast, n, file)
+    return getter
+
+
+def opt_factory(keyword: str, default: T, *, cast: Callable[[Any], T] | None = None,
+                n: int | None = None) -> Callable[[Dataset], T]:
+    """
+    Return opt() specialised for *keyword*, called as getter(ds).
+    """
+    tag = _tag(keyword)
+
+    def getter(ds: Dataset) -> T:
+        return _optional(_lookup(ds, keyword, tag), default, cast, n)
+    return getter
+
 # Small casting helpers (handy across modules)
 
 
@@ -58,6 +116,10 @@ def tuple_of_float(seq: Iterable[Any]) -> tuple[float, ...]:
     return tuple(float(x) for x in seq)
 
 
+def ndarray_of_float(seq: Iterable[Any]) -> np.ndarray:
+    return np.asarray(seq, dtype=np.float64)
+
+
 def as_int(x: Any) -> int:
     return int(x)
 
@@ -67,7 +129,7 @@ def as_str(x: Any) -> str:
 
 
 __all__ = [
-    "req", "opt",
-    "tuple_of_float", "as_int", "as_str",
+    "req", "opt", "req_factory", "opt_factory",
+    "tuple_of_float", "ndarray_of_float", "as_int", "as_str",
     "DicomAttributeMissingError", "DicomAttributeInvalidError",
 ]
@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 def export_geo(ct: CTModel, rs: RTStruct, output_path: Path) -> None:
     content = TopasGeo.generate(ct, rs)
     output_path.write_text(content)
-    logger.info(f"Wrote Topas geometry file: {output_path.resolve()}")
+    logger.info("Wrote Topas geometry file: %s", output_path)
 
 
 class TopasGeo:
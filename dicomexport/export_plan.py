@@ -1,44 +1,60 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from dicomexport.model_plan import Plan
+from dicomexport.model_plan import Plan, Field
 from dicomexport.beam_model import BeamModel
 from dicomexport.export_plan_topas import TopasPlan
 from dicomexport.export_plan_racehorse import RacehorsePlan
 
 logger = logging.getLogger(__name__)
 
+WRITE_BUFFER_SIZE = 1 << 20  # bytes, output files are written in large chunks
+
 
 # toplevel export plan method
 def export_plan(pln: Plan, bm: BeamModel, output_base_path: Path, field_nr: int = -1,
-                nominal: bool = True, nstat: int = int(1e6), fmt: str = "topas") -> None:
+                nominal: bool = True, nstat: int = int(1e6), fmt: str = "topas", workers: int = 1) -> None:
     """
     Export one or all fields from a Plan to output files.
     If field_nr >= 1, export only that field.
     If field_nr < 0, export all fields with field number appended.
     First field in a plan is field 1.
+    If workers is not 1, fields are exported in parallel using that many processes (0 uses all cores).
     """
     # pick fields
     if field_nr >= 1:
-        fields = [(field_nr, pln.fields[field_nr - 1])]
+        fields = [pln.fields[field_nr - 1]]
+    else:
+        fields = pln.fields
+
+    if workers != 1 and len(fields) > 1:
+        with ProcessPoolExecutor(max_workers=workers or None) as executor:
+            futures = [executor.submit(_export_field, field, bm, output_base_path, nominal, nstat, fmt)
+                       for field in fields]
+            for future in futures:
+                future.result()  # re-raise any exception from the workers
+    else:
+        for field in fields:
+            _export_field(field, bm, output_base_path, nominal, nstat, fmt)
+
+
+def _export_field(field: Field, bm: BeamModel, output_base_path: Path, nominal: bool, nstat: int, fmt: str) -> None:
+    """Export a single field. Module level, so it can be dispatched to worker processes."""
+    if fmt == "racehorse":
+        # mono-energetic: one file per layer
+        for layer_index, layer in enumerate(field.layers):
+            p = _out_path(output_base_path, field.number, f"_layer{layer.number:02d}")
+            text = RacehorsePlan.generate(field, layer_index, name=str(p), test_mode=False)
+            p.write_text(text)
+            logger.debug("Exported field %d layer %d to Racehorse format.", field.number, layer.number)
+    elif fmt == "topas":
+        with _out_path(output_base_path, field.number).open("w", buffering=WRITE_BUFFER_SIZE, encoding="utf-8") as f:
+            TopasPlan.generate(field, bm, nominal=nominal, nstat=nstat, out=f)
+        logger.debug("Exported field %d to Topas format.", field.number)
     else:
-        fields = list(enumerate(pln.fields, start=1))
-
-    for idx, field in fields:
-        if fmt == "racehorse":
-            # mono-energetic: one file per layer
-            for layer_index, layer in enumerate(field.layers):
-                p = _out_path(output_base_path, field.number, f"_layer{layer.number:02d}")
-                text = RacehorsePlan.generate(field, layer_index, name=str(p), test_mode=False)
-                p.write_text(text)
-                logger.debug(f"Exported field {field.number} layer {layer.number} to Racehorse format.")
-        elif fmt == "topas":
-            text = TopasPlan.generate(field, bm, nominal=nominal, nstat=nstat)
-            _out_path(output_base_path, field.number).write_text(text)
-            logger.debug(f"Exported field {field.number} to Topas format.")
-        else:
-            raise ValueError(f"Unknown format: {fmt}")
+        raise ValueError(f"Unknown format: {fmt}")
 
 
 def _out_path(base: Path, field_idx: int, extra: str = "") -> Path:
-    return base.with_name(f"{base.stem}_field{field_idx:02d}{extra}{base.suffix}")
+    return base.parent / f"{base.stem}_field{field_idx:02d}{extra}{base.suffix}"
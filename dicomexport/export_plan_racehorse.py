@@ -1,5 +1,6 @@
 import logging
 import datetime
+import functools
 
 from dicomexport.__version__ import __version__
 from dicomexport.model_plan import Field
@@ -8,6 +9,8 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+_SPOT_LINE = "{:2d},{:8.2f},{:8.2f},{:8.2f}\n"
+
 
 class RacehorsePlan:
     @staticmethod
@@ -16,45 +19,53 @@ class RacehorsePlan:
         Export the field to a Varian Racehorse Mode input file.
         """
 
-        c = "* ----- RACEHORSE Spot List -----\n"
-
-        check_total_mu = 0.0  # Accumulate total MU for all spots in the layer
-
         layer = myfield.layers[layer_index]
-        c += f"* Field: {myfield.number:02d}"  # no newline
-        c += f"  Layer: {layer.number:02d}\n"  # TODO: nominal energy, but does RACEHORSE allow for it?
-        c += "\n"
-        c += _racehorse_header(name)
-
-        for n, spot in enumerate(layer.spots):
-            c += f"{n:2d},{spot.x:8.2f},{spot.y:8.2f},{spot.mu:8.2f}\n"  # index, mm, mm, monitor units
-            check_total_mu += spot.mu
 
+        parts = [
+            "* ----- RACEHORSE Spot List -----\n",
+            # TODO: nominal energy, but does RACEHORSE allow for it?
+            f"* Field: {myfield.number:02d}  Layer: {layer.number:02d}\n\n",
+            _racehorse_header(name),
+        ]
+        n_spots = layer.n_spots
+        xs = layer.x
+        ys = layer.y
+        mu = layer.mu
+
+        # index, mm, mm, monitor units
+        parts.extend(map(_SPOT_LINE.format, range(n_spots), xs.tolist(), ys.tolist(), mu.tolist()))
+
+        check_total_mu = float(mu.sum())  # total MU for all spots in the layer
         if not np.isclose(check_total_mu, layer.cum_mu, rtol=1e-4):
             raise ValueError(
                 f"Total MU for layer {layer.number:02d}: {check_total_mu:.4f} differs from expected "
                 f"{layer.cum_mu:.4f} by more than 0.01%."
             )
 
-        return c
+        return "".join(parts)
 
 
 def _racehorse_header(name: str = "") -> str:
     """
     Generate the header for the Racehorse input file.
     """
+    return _racehorse_header_cached(name, datetime.date.today().strftime("%d-%m-%Y"))
 
-    dt = datetime.datetime.now()
-    tmstr = dt.strftime("%d-%m-%Y")
 
-    h = "#HEADER\n"
-    h += f"NAME, {name}\n"
-    h += f"DATE, {tmstr}\n"
-    h += "CREATORNAME, DicomExport\n"
-    h += f"CREATORVERSION, {__version__}\n"
-    h += "\n"
-
-    v = "#VALUES\n"
-    v += "Index;Position x;Position y;Dose\n"  # if RACEHORSE allows for it, rename "Dose" to "MU", units in mm
-
-    return h + v
+@functools.lru_cache(maxsize=64)
+def _racehorse_header_cached(name: str, date_str: str) -> str:
+    """
+    Build the Racehorse header for a given name and date string.
+    The header is identical for all layers exported on the same day, so it is cached.
+    """
+    lines = [
+        "#HEADER",
+        f"NAME, {name}",
+        f"DATE, {date_str}",
+        "CREATORNAME, DicomExport",
+        f"CREATORVERSION, {__version__}",
+        "",
+        "#VALUES",
+        "Index;Position x;Position y;Dose",  # if RACEHORSE allows for it, rename "Dose" to "MU", units in mm
+    ]
+    return "\n".join(lines) + "\n"
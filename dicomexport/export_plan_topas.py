@@ -1,5 +1,7 @@
+import io
 import logging
 import numpy as np
+from typing import Optional, TextIO
 
 from dicomexport.model_plan import Field
 from dicomexport.beam_model import BeamModel
@@ -11,9 +13,12 @@ logger = logging.getLogger(__name__)
 class TopasPlan:
     @staticmethod
     def generate(myfield: Field, bm: BeamModel, nominal: bool,
-                 nstat=100000, test_mode=False) -> str:
+                 nstat=100000, test_mode=False, out: Optional[TextIO] = None) -> Optional[str]:
         """
         Export the field to a topas input file.
+
+        If out is given, the file sections are written to it as they are generated and None is returned.
+        Otherwise the complete file content is returned as a string.
         """
         logger.debug(
             f"Generating Topas input for field {myfield.number} with nominal={nominal} and nstat={nstat}")
@@ -25,7 +30,7 @@ class TopasPlan:
         nstat_scale = TopasPlan.calculate_scaling_factor(myfield, nstat)
 
         # show some information about the field
-        TopasPlan.show_plan_data(myfield, bm, nstat=nstat)
+        TopasPlan.show_plan_data(myfield, bm, nstat=nstat, nstat_scale=nstat_scale)
         # logger.info(f"Beam model position:          {bm.beam_model_position} mm upstream of isocenter")
         # logger.info(f"SAD X: {sad_x:.2f} mm, SAD Y:     {sad_y:.2f} mm")
         # logger.info(f"Proton budget for this plan:  {myfield.n_particles:.3e} protons")
@@ -36,109 +41,124 @@ class TopasPlan:
         # logger.debug(f"Beam Meterset Weight:         {myfield.meterset_weight_final:.2f}")
         # logger.info(f"Beam Meterset:                {myfield.cum_mu:.2f} MU")
 
-        # build output lines instead of writing to file
-        lines = []
-        lines.append(TopasText.header(myfield, nstat_scale, nstat))
-        lines.append(TopasText.header2())
+        # write sections as they are built, either to the given stream or to a string buffer
+        buf = io.StringIO() if out is None else out
+        buf.write(TopasText.header(myfield, nstat_scale, nstat))
+        buf.write(TopasText.header2())
 
-        lines.append(TopasText.variables(myfield))
+        buf.write(TopasText.variables(myfield))
         if test_mode:
-            lines.append(TopasText.setup())
-            lines.append(TopasText.world_setup())
-            lines.append(TopasText.geometry_gantry())
-            lines.append(TopasText.geometry_couch())
-            lines.append(TopasText.geometry_dcm_to_iec())
-        lines.append(TopasText.geometry_beam_position_timefeature(
+            buf.write(TopasText.setup())
+            buf.write(TopasText.world_setup())
+            buf.write(TopasText.geometry_gantry())
+            buf.write(TopasText.geometry_couch())
+            buf.write(TopasText.geometry_dcm_to_iec())
+        buf.write(TopasText.geometry_beam_position_timefeature(
             bm.beam_model_position))
-        lines.append(TopasText.geometry_range_shifter(myfield))
-        lines.append(TopasText.field_beam_timefeature())
+        buf.write(TopasText.geometry_range_shifter(myfield))
+        buf.write(TopasText.field_beam_timefeature())
 
-        lines.append(TopasPlan.time_features_string(
-            myfield, bm, nominal, nstat))
+        TopasPlan.time_features_string(myfield, bm, nominal, nstat, out=buf, nstat_scale=nstat_scale)
 
-        topas_text = "".join(lines)
-        return topas_text
+        if out is None:
+            return buf.getvalue()
+        return None
 
     @staticmethod
-    def time_features_string(myfield: Field, bm: BeamModel, nominal: bool, nstat: int = int(1e6)) -> str:
+    def time_features_string(myfield: Field, bm: BeamModel, nominal: bool, nstat: int = int(1e6),
+                             out: Optional[TextIO] = None, nstat_scale: Optional[float] = None) -> Optional[str]:
         """
         Build the TIME FEATURES section for a Topas file and return as a string.
+        If out is given, the section is written to it instead and None is returned.
+        nstat_scale is calculated from nstat unless already known by the caller.
         """
 
         n_spots = myfield.n_spots
-        times = np.zeros(n_spots)
-        energies = np.zeros(n_spots)
-        energies_real = np.zeros(n_spots)  # actual energies at the beam model position
-        espreads = np.zeros(n_spots)
-        posx = np.zeros(n_spots)
-        angx = np.zeros(n_spots)
-        posy = np.zeros(n_spots)
-        angy = np.zeros(n_spots)
-        sigx = np.zeros(n_spots)
-        sigy = np.zeros(n_spots)
-        sigxp = np.zeros(n_spots)
-        sigyp = np.zeros(n_spots)
-        corx = np.zeros(n_spots)
-        cory = np.zeros(n_spots)
-        nparts = np.zeros(n_spots)
-
-        _spot_index = 0
-        for mylayer in myfield.layers:
-            # input dicom files may have been designed with nominal or actual energies
-            # (for artificial dicom files for research purposes)
-            energy = mylayer.energy_nominal if nominal else mylayer.energy_measured
-            espread = mylayer.espread
-            sad_x, sad_y = mylayer.sad
-
-            for spot in mylayer.spots:
-                times[_spot_index] = _spot_index + 1
-                energies[_spot_index] = energy  # nominal energies
-                energies_real[_spot_index] = mylayer.energy_measured  # actual energies
-                espreads[_spot_index] = espread
-                posx[_spot_index] = spot.x * \
-                    (sad_x - bm.beam_model_position) / sad_x
-                angx[_spot_index] = np.degrees(np.arctan(spot.x / sad_x))
-                posy[_spot_index] = spot.y * \
-                    (sad_y - bm.beam_model_position) / sad_y
-                angy[_spot_index] = np.degrees(np.arctan(spot.y / sad_y))
-                sigx[_spot_index] = bm.f_sx(mylayer.energy_nominal)
-                sigy[_spot_index] = bm.f_sy(mylayer.energy_nominal)
-                sigxp[_spot_index] = bm.f_divx(mylayer.energy_nominal)
-                sigyp[_spot_index] = bm.f_divy(mylayer.energy_nominal)
-                corx[_spot_index] = bm.f_covx(mylayer.energy_nominal)
-                cory[_spot_index] = bm.f_covy(mylayer.energy_nominal)
-                nparts[_spot_index] = spot.mu * mylayer.mu_to_part_coef
-                _spot_index += 1
-
-        nstat_scale = TopasPlan.calculate_scaling_factor(myfield, nstat)
-        inv_nstat_scale = 1.0 / nstat_scale
-
-        lines = []
-        lines.append("##############################################\n")
-        lines.append("###  T  I  M  E    F  E  A  T  U  R  E  S  ###\n")
-        lines.append("##############################################\n\n")
-
-        lines.append(f"i:Tf/NumberOfSequentialTimes         = {n_spots}\n")
-        lines.append(f"d:Tf/TimelineStart                   = {1} s\n")
-        lines.append(
+        spot_counts = [mylayer.n_spots for mylayer in myfield.layers]
+        times = np.arange(1, n_spots + 1, dtype=np.int64)
+
+        # Per-layer values, later expanded to one entry per spot.
+        layer_energy_nominal = np.array([mylayer.energy_nominal for mylayer in myfield.layers], dtype=np.float64)
+        layer_energy_measured = np.array([mylayer.energy_measured for mylayer in myfield.layers], dtype=np.float64)
+        layer_sad = np.array([mylayer.sad for mylayer in myfield.layers], dtype=np.float64).reshape(-1, 2)
+
+        # index of the layer each spot belongs to, used to expand per-layer values to spots
+        spot_layer = np.repeat(np.arange(len(spot_counts)), spot_counts)
+        sad_x = layer_sad[spot_layer, 0]
+        sad_y = layer_sad[spot_layer, 1]
+
+        spots = np.concatenate([mylayer.spots_array for mylayer in myfield.layers])
+        spot_x = spots["x"]
+        spot_y = spots["y"]
+        spot_mu = spots["mu"]
+
+        # All per-spot features live in one contiguous buffer, one row per feature.
+        feature_buf = np.empty((13, n_spots), dtype=np.float64)
+        (energies_real, espreads, posx, angx, posy, angy,
+         sigx, sigy, sigxp, sigyp, corx, cory, spot_weight) = feature_buf
+
+        # energies_real are the actual energies at the beam model position,
+        # beam model parameters only depend on the nominal layer energy
+        layer_features = (
+            (energies_real, layer_energy_measured),
+            (espreads, [mylayer.espread for mylayer in myfield.layers]),
+            (sigx, bm.f_sx(layer_energy_nominal)),
+            (sigy, bm.f_sy(layer_energy_nominal)),
+            (sigxp, bm.f_divx(layer_energy_nominal)),
+            (sigyp, bm.f_divy(layer_energy_nominal)),
+            (corx, bm.f_covx(layer_energy_nominal)),
+            (cory, bm.f_covy(layer_energy_nominal)),
+        )
+        for row, layer_values in layer_features:
+            np.take(np.asarray(layer_values, dtype=np.float64), spot_layer, out=row)
+
+        # spot positions are projected back to the beam model position, the factor only depends on the layer SAD
+        layer_projection = 1.0 - bm.beam_model_position / layer_sad
+        np.multiply(spot_x, layer_projection[spot_layer, 0], out=posx)
+        np.multiply(spot_y, layer_projection[spot_layer, 1], out=posy)
+        np.arctan2(spot_x, sad_x, out=angx)
+        np.arctan2(spot_y, sad_y, out=angy)
+        angx *= 180.0 / np.pi
+        angy *= 180.0 / np.pi
+        mu_to_part_coef = np.array([mylayer.mu_to_part_coef for mylayer in myfield.layers], dtype=np.float64)
+        np.multiply(spot_mu, mu_to_part_coef[spot_layer], out=spot_weight)
+
+        if nstat_scale is None:
+            nstat_scale = TopasPlan.calculate_scaling_factor(myfield, nstat)
+        spot_weight *= 1.0 / nstat_scale
+
+        buf = io.StringIO() if out is None else out
+        buf.write("##############################################\n")
+        buf.write("###  T  I  M  E    F  E  A  T  U  R  E  S  ###\n")
+        buf.write("##############################################\n\n")
+
+        buf.write(f"i:Tf/NumberOfSequentialTimes         = {n_spots}\n")
+        buf.write(f"d:Tf/TimelineStart                   = {1} s\n")
+        buf.write(
             f"d:Tf/TimelineEnd                     = {n_spots+1} s\n\n")
 
-        lines.append(_topas_array(times, energies_real, "Energy", "f", 3, "MeV"))
-        lines.append(_topas_array(times, espreads, "EnergySpread", "f", 5, ""))
-        lines.append(_topas_array(times, posx, "spotPositionX", "f", 2, "mm"))
-        lines.append(_topas_array(times, angx, "spotAngleX", "f", 3, "deg"))
-        lines.append(_topas_array(times, posy, "spotPositionY", "f", 2, "mm"))
-        lines.append(_topas_array(times, angy, "spotAngleY", "f", 3, "deg"))
-        lines.append(_topas_array(times, sigx, "SigmaX", "f", 5, "mm"))
-        lines.append(_topas_array(times, sigy, "SigmaY", "f", 5, "mm"))
-        lines.append(_topas_array(times, sigxp, "SigmaXprime", "f", 5, ""))
-        lines.append(_topas_array(times, sigyp, "SigmaYprime", "f", 5, ""))
-        lines.append(_topas_array(times, corx, "CorrelationX", "f", 5, ""))
-        lines.append(_topas_array(times, cory, "CorrelationY", "f", 5, ""))
-        lines.append(_topas_array(times, nparts *
-                     inv_nstat_scale, "spotWeight", "f", 0, ""))
-
-        return "".join(lines)
+        features = [
+            # values, name, format, precision, unit
+            (energies_real, "Energy", "f", 3, "MeV"),
+            (espreads, "EnergySpread", "f", 5, ""),
+            (posx, "spotPositionX", "f", 2, "mm"),
+            (angx, "spotAngleX", "f", 3, "deg"),
+            (posy, "spotPositionY", "f", 2, "mm"),
+            (angy, "spotAngleY", "f", 3, "deg"),
+            (sigx, "SigmaX", "f", 5, "mm"),
+            (sigy, "SigmaY", "f", 5, "mm"),
+            (sigxp, "SigmaXprime", "f", 5, ""),
+            (sigyp, "SigmaYprime", "f", 5, ""),
+            (corx, "CorrelationX", "f", 5, ""),
+            (cory, "CorrelationY", "f", 5, ""),
+            (spot_weight, "spotWeight", "f", 0, ""),
+        ]
+        for arr, name, fmt, precision, unit in features:
+            _topas_array(times, arr, name, fmt, precision, unit, buf=buf)
+
+        if out is None:
+            return buf.getvalue()
+        return None
 
     @staticmethod
     def calculate_scaling_factor(myfield: Field, nstat: int = int(1e6)) -> float:
@@ -150,10 +170,12 @@ class TopasPlan:
         return nstat_scale
 
     @staticmethod
-    def show_plan_data(myfield: Field, bm: BeamModel, nstat: int = int(1e6)) -> None:
+    def show_plan_data(myfield: Field, bm: BeamModel, nstat: int = int(1e6),
+                       nstat_scale: Optional[float] = None) -> None:
         sad_x = myfield.layers[0].sad[0]
         sad_y = myfield.layers[0].sad[1]
-        nstat_scale = TopasPlan.calculate_scaling_factor(myfield, nstat)
+        if nstat_scale is None:
+            nstat_scale = TopasPlan.calculate_scaling_factor(myfield, nstat)
 
         # show some information about the field
         logger.info(
@@ -171,19 +193,30 @@ class TopasPlan:
         logger.info(f"Beam Meterset:                {myfield.cum_mu:.2f} MU")
 
 
-def _topas_array(time_arr: np.array, arr: np.array, name: str, fmt: str = "f", precision: int = 0, unit=""):
-    """generate string of time data."""
-    s = ""
+# line templates for a single time feature, bound once at import
+_FUNCTION_LINE = 's:Tf/{name}/Function                 = "Step"\n'.format
+_TIMES_LINE = "dv:Tf/{name}/Times                   = {n} {t} s\n".format
+_VALUES_LINE = "{pre}:Tf/{name}/Values                   = {n} {v} {u}\n\n\n".format
+
+
+def _topas_array(time_arr: np.array, arr: np.array, name: str, fmt: str = "f", precision: int = 0, unit="", *,
+                 buf: TextIO) -> None:
+    """write string of time data to buf."""
     n_spots = arr.size
-    s += f"s:Tf/{name}/Function                 = \"Step\"\n"
     if unit == "":
         _pre = "uv"
     else:
         _pre = "dv"
 
-    _ft = " ".join(map(str, time_arr.astype(int)))
-    _fa = " ".join(f"{x:.{precision}{fmt}}" for x in arr)
-    s += f"dv:Tf/{name}/Times                   = {n_spots} {_ft} s\n"
-    s += f"{_pre}:Tf/{name}/Values                   = {arr.size} {_fa} {unit}\n"
-    s += "\n\n"
-    return s
+    if time_arr.dtype.kind != "i":
+        time_arr = time_arr.astype(np.int64)
+    _ft = _format_values("%d", time_arr)
+    _fa = _format_values(f"%.{precision}{fmt}", arr)
+    buf.write(_FUNCTION_LINE(name=name))
+    buf.write(_TIMES_LINE(name=name, n=n_spots, t=_ft))
+    buf.write(_VALUES_LINE(pre=_pre, name=name, n=n_spots, v=_fa, u=unit))
+
+
+def _format_values(fmt: str, arr: np.ndarray) -> str:
+    """Format all values of arr with fmt, separated by spaces, in a single %-operation like np.savetxt does per row."""
+    return " ".join([fmt] * arr.size) % tuple(arr.tolist())
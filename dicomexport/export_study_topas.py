@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -8,21 +9,32 @@ from dicomexport.beam_model import BeamModel
 from dicomexport.topas_text import TopasText
 from dicomexport.model_plan import Plan, Field
 from dicomexport.export_plan_topas import TopasPlan
+from dicomexport.export_plan import WRITE_BUFFER_SIZE
 
 
 logger = logging.getLogger(__name__)
 
 
 def export_study_topas(ct: CTModel, rs: RTStruct, plan: Plan, output_base_path: Path,
-                       field_nr: int = 0, dose_path: Optional[Path] = None, nstat: int = int(1e6)) -> None:
+                       field_nr: int = 0, dose_path: Optional[Path] = None, nstat: int = int(1e6),
+                       workers: int = 1) -> None:
     """
     Export the CT and RTStruct models to a Topas-compatible geometry file.
+    If workers is not 1, all fields are exported in parallel using that many processes (0 uses all cores).
     """
 
     if field_nr < 0 or field_nr >= len(plan.fields):
         raise ValueError(
             f"Invalid field number: {field_nr}. Must be between 0 and {len(plan.fields) - 1}.")
-    if field_nr == 0:
+    if field_nr == 0 and workers != 1 and len(plan.fields) > 1:
+        # Export all fields in parallel
+        with ProcessPoolExecutor(max_workers=workers or None) as executor:
+            futures = [executor.submit(_export_study_field_topas, ct, rs, field, plan.beam_model,
+                                       output_base_path, dose_path, nstat=nstat)
+                       for field in plan.fields]
+            for future in futures:
+                future.result()  # re-raise any exception from the workers
+    elif field_nr == 0:
         # Export all fields
         for field in plan.fields:
             logger.info("=" * 50)
@@ -48,8 +60,7 @@ def _export_study_field_topas(ct: CTModel, rs: RTStruct, fld: Field, bm: Optiona
     # topas results will be written to output/field_number (no extension, will be handled by Topas
     # make target string for output file:
     if output_base_path:
-        topas_output_file_str_no_suffix = output_base_path.with_name(
-            f"{output_base_path.stem}_field{fld.number}")
+        topas_output_file_str_no_suffix = output_base_path.parent / f"{output_base_path.stem}_field{fld.number}"
     else:
         topas_output_file_str_no_suffix = Path(f"foobar_field{fld.number}")
 
@@ -79,27 +90,31 @@ def _export_study_field_topas(ct: CTModel, rs: RTStruct, fld: Field, bm: Optiona
     lines.append(TopasText.scorer_setup_dicom(
         topas_output_path=str(topas_output_file_str_no_suffix)))
 
+    if output_base_path is None:
+        output_base_path = Path(f"topas_geometry_field{fld.number}")
+
+    output_path = output_base_path.parent / f"{output_base_path.stem}_field{fld.number:02d}.txt"
+
     # For now, if no beam model is provided, spots and info are not shown.
     # This should be revisited in the future.
     # best would be to refactor the code to have a default beam model with basic parameters.
     # and move the load beam model from __init__.py to a new dedicated function in BeamModel class.
-    if bm:
-        lines.append(TopasPlan.time_features_string(
-            fld, bm, nominal=True, nstat=nstat))
-        topas_string = "\n".join(lines)
+    with output_path.open("w", buffering=WRITE_BUFFER_SIZE, encoding="utf-8") as f:
+        # write the sections one by one rather than joining them into one string first
+        f.write(lines[0])
+        for section in lines[1:]:
+            f.write("\n")
+            f.write(section)
+        if bm:
+            # time features are the bulk of the file, stream them directly into the file
+            f.write("\n")
+            TopasPlan.time_features_string(fld, bm, nominal=True, nstat=nstat, out=f, nstat_scale=nstat_scale)
 
+    if bm:
         # show some information about the field
-        TopasPlan.show_plan_data(fld, bm, nstat=nstat)
+        TopasPlan.show_plan_data(fld, bm, nstat=nstat, nstat_scale=nstat_scale)
     else:
-        topas_string = "\n".join(lines)
         logger.warning(
             "No beam model provided. Limited conversion, TODO: fix this in the future.")
 
-    if output_base_path is None:
-        output_base_path = Path(f"topas_geometry_field{fld.number}")
-
-    output_path = output_base_path.with_name(
-        f"{output_base_path.stem}_field{fld.number:02d}.txt")
-    output_path.write_text(topas_string)
-    logger.info(
-        f"Wrote Topas geometry file for field {fld.number}: {output_path.resolve()}")
+    logger.info("Wrote Topas geometry file for field %d: %s", fld.number, output_path)
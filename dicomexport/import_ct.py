@@ -1,110 +1,123 @@
 import logging
+import os
 import pydicom
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from pathlib import Path
-from typing import List, Tuple
 
-from dicomexport.ds_get import req, opt, tuple_of_float, as_int, as_str
+from dicomexport.ds_get import req_factory, opt_factory, ndarray_of_float, as_int, as_str
 
 from dicomexport.model_ct import CTModel, Image
 
 logger = logging.getLogger(__name__)
 
-
-def get_ct_files_sorted_by_instance_number(directory: Path) -> List[Path]:
+# Attribute getters for CT slices, keyed by the Image field they fill.
+# REQUIRED — fail fast if missing/malformed
+_REQUIRED = {
+    "pixel_spacing": req_factory("PixelSpacing", cast=ndarray_of_float, n=2),
+    "image_orientation": req_factory("ImageOrientationPatient", cast=ndarray_of_float, n=6),
+    "image_position_patient": req_factory("ImagePositionPatient", cast=ndarray_of_float, n=3),
+    "rows": req_factory("Rows", cast=int),
+    "columns": req_factory("Columns", cast=int),
+    "patient_position": req_factory("PatientPosition", cast=as_str),
+}
+# OPTIONAL — default silently if missing/odd
+_OPTIONAL = {
+    "sop_class_uid": opt_factory("SOPClassUID", "", cast=as_str),
+    "sop_instance_uid": opt_factory("SOPInstanceUID", "", cast=as_str),
+    "modality": opt_factory("Modality", "", cast=as_str),
+    "series_description": opt_factory("SeriesDescription", "", cast=as_str),
+    "instance_number": opt_factory("InstanceNumber", 0, cast=as_int),
+    "patient_name": opt_factory("PatientName", "", cast=as_str),
+    "patient_id": opt_factory("PatientID", "", cast=as_str),
+}
+
+
+def load_ct(mydir: Path, workers: int = 1) -> CTModel:
     """
-    Return a list of CT DICOM file paths in the directory,
-    sorted by the DICOM 'InstanceNumber' tag.
+    Load a series of CT DICOM files from a directory and return a CTModel.
 
-    Reason: we cannot rely on the file names to be sorted correctly,
-    e.g. when the files are copied from a PACS system or running numbering as 1 instead of 001.
+    If workers is not 1, slices are read in parallel using that many processes (0 uses all cores).
     """
-    files = list(directory.glob("CT*.dcm"))
-    if not files:
+    if not mydir.is_dir():
+        raise ValueError(f"{mydir} is not a directory")
+
+    # Each file is read only once, the slices are ordered after loading.
+    # We cannot rely on the file names to be sorted correctly,
+    # e.g. when the files are copied from a PACS system or running numbering as 1 instead of 001.
+    with os.scandir(mydir) as it:
+        ct_files = [Path(e.path) for e in it
+                    if e.name.startswith("CT") and e.name.endswith(".dcm") and e.is_file()]
+    if not ct_files:
         raise FileNotFoundError(
-            f"No CT DICOM files matching 'CT*.dcm' found in {directory}")
+            f"No CT DICOM files matching 'CT*.dcm' found in {mydir}")
+
+    ct_model = CTModel()
 
-    def get_instance_number(file: Path) -> int:
-        ds = pydicom.dcmread(file, stop_before_pixels=True)
-        if not hasattr(ds, 'InstanceNumber'):
-            raise AttributeError(
-                f"File {file} is missing 'InstanceNumber' DICOM tag.")
-        return int(ds.InstanceNumber)
+    if workers != 1 and len(ct_files) > 1:
+        # slices are independent, so parse them in a process pool; map() keeps the order of ct_files.
+        # Workers return plain Image dataclasses, which are cheap to pickle unlike pydicom datasets.
+        with ProcessPoolExecutor(max_workers=workers or None) as ex:
+            ct_model.images.extend(ex.map(_load_ct_slice, ct_files, chunksize=8))
+    else:
+        ct_model.images.extend(_load_ct_slice(file) for file in ct_files)
+
+    # Compute slice positions for all slices at once, do not use slice_location from DICOM directly,
+    # since it is deprecated.
+    if ct_model.images:
+        ipp = np.array([img.image_position_patient for img in ct_model.images])
+        iop = np.array([img.image_orientation for img in ct_model.images])
+        for img, pos in zip(ct_model.images, _slice_positions(ipp, iop).tolist()):
+            img.slice_position = pos
+
+    # Sort images by z-position, instance number breaks ties
+    ct_model.images.sort(key=lambda img: (img.slice_position, img.instance_number))
+    # the images are final now, so the shared header data and slice spacing are computed once
+    ct_model.cache_header()
 
-    files.sort(key=get_instance_number)
-    return files
+    return ct_model
 
 
-def load_ct(mydir: Path) -> CTModel:
+def _load_ct_slice(file: Path) -> Image:
     """
-    Load a series of CT DICOM files from a directory and return a CTModel.
+    Read a single CT DICOM file and return it as an Image.
     """
-    if not mydir.is_dir():
-        raise ValueError(f"{mydir} is not a directory")
-
-    ct_files = get_ct_files_sorted_by_instance_number(mydir)
+    # pixel data are not needed for the pipeline, so the file is only read up to PixelData
+    ds = pydicom.dcmread(file, stop_before_pixels=True)
+    logger.debug(f"Loading CT slice: {file.name}")
 
-    ct_model = CTModel()
-
-    for file in ct_files:
-        ds = pydicom.dcmread(file, stop_before_pixels=False)
-        logger.debug(f"Loading CT slice: {file.name}")
-
-        # The next parts are just tests for a new scheme for reading DICOM files which should be more robust
-        # in case of missing tags which are non essential
-        # The following approach is designed to robustly read DICOM files, handling missing or non-essential tags gracefully.
-        # Required tags will raise errors if missing or malformed, while optional tags will default to safe values.
-        # This scheme improves resilience when processing DICOM data from diverse sources.
-        #
-        img = Image(
-            # REQUIRED — fail fast if missing/malformed
-            pixel_spacing=req(ds, "PixelSpacing", cast=tuple_of_float, n=2, file=file),  # TODO: fix pylance warning
-            image_orientation=req(ds, "ImageOrientationPatient", cast=tuple_of_float, n=6, file=file),
-            image_position_patient=req(ds, "ImagePositionPatient", cast=tuple_of_float, n=3, file=file),
-            rows=req(ds, "Rows", cast=int, file=file),
-            columns=req(ds, "Columns", cast=int, file=file),
-            patient_position=req(ds, "PatientPosition", cast=as_str, file=file),
-
-            # OPTIONAL — default silently if missing/odd
-            sop_class_uid=opt(ds, "SOPClassUID", "", cast=as_str),
-            sop_instance_uid=opt(ds, "SOPInstanceUID", "", cast=as_str),
-            modality=opt(ds, "Modality", "", cast=as_str),
-            series_description=opt(ds, "SeriesDescription", "", cast=as_str),
-            instance_number=opt(ds, "InstanceNumber", 0, cast=as_int),
-            patient_name=opt(ds, "PatientName", "", cast=as_str),
-            patient_id=opt(ds, "PatientID", "", cast=as_str),
-        )
-
-        # Compute slice_position, do not use slice_location from DICOM directly, since it is deprecated.
-        img.slice_position = _get_slice_position(img.image_position_patient, img.image_orientation)
-
-        ct_model.images.append(img)
-
-    # Sort images by z-position if needed:
-    ct_model.images.sort(key=lambda img: img.slice_position)
+    # The next parts are just tests for a new scheme for reading DICOM files which should be more robust
+    # in case of missing tags which are non essential
+    # The following approach is designed to robustly read DICOM files, handling missing or non-essential tags gracefully.
+    # Required tags will raise errors if missing or malformed, while optional tags will default to safe values.
+    # This scheme improves resilience when processing DICOM data from diverse sources.
+    #
+    img = Image(
+        **{name: get(ds, file) for name, get in _REQUIRED.items()},
+        **{name: get(ds) for name, get in _OPTIONAL.items()},
+    )
 
-    return ct_model
+    return img
 
 
-def _get_slice_position(ipp: Tuple[float, float, float], iop: Tuple[float, float, float, float, float, float]) -> float:
+def _slice_positions(ipp: np.ndarray, iop: np.ndarray) -> np.ndarray:
     """
     SliceLocation in DICOM is deprecated, and some CTs may not have it or even fill it with garbage values.
     Therefore, it will be taken from image_position_patient, taking scan orientation into account.
 
     Args:
-        ipp: Image Position Patient (3 floats) as stored in DICOM.
-        iop: Image Orientation Patient (6 floats) as stored in DICOM.
-            - The first 3 elements (iop[0:3]) correspond to the row direction (X).
-            - The last 3 elements (iop[3:6]) correspond to the column direction (Y).
+        ipp: Image Position Patient of N slices, shape (N, 3), as stored in DICOM.
+        iop: Image Orientation Patient of N slices, shape (N, 6), as stored in DICOM.
+            - The first 3 columns (iop[:, 0:3]) correspond to the row direction (X).
+            - The last 3 columns (iop[:, 3:6]) correspond to the column direction (Y).
             - The normal vector (Z direction) is computed as the cross product of row and column.
 
     Returns:
-        The position of the slice along the normal vector (Z direction).
+        The position of each slice along its normal vector (Z direction), shape (N,).
     """
-
-    # ipp = np.array(ipp)
-    # iop = np.array(iop)
-    row = iop[0:3]
-    col = iop[3:6]
-    normal = np.cross(row, col)
-    return float(np.dot(ipp, normal))
+    # scalar triple product expanded on the columns, cheaper than np.cross + np.dot
+    r0, r1, r2, c0, c1, c2 = iop.T
+    nx = r1 * c2 - r2 * c1
+    ny = r2 * c0 - r0 * c2
+    nz = r0 * c1 - r1 * c0
+    return ipp[:, 0] * nx + ipp[:, 1] * ny + ipp[:, 2] * nz
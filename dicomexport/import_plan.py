@@ -1,8 +1,9 @@
 import logging
+import os
 from pathlib import Path
 
 from dicomexport.model_plan import Plan
-from dicomexport.import_plan_pld import load_plan_pld
+from dicomexport.import_plan_pld import load_plan_header_pld, load_plan_pld
 from dicomexport.import_plan_dicom import load_plan_dicom
 from dicomexport.import_plan_rst import load_plan_rst
 
@@ -13,18 +14,7 @@ def load_plan(path: Path, **kwargs) -> Plan:
     """
     Load a treatment plan from a file (PLD, DICOM RT Ion Plan, RST) and return a Plan object.
     """
-
-    # if path is a directory, look for a RN*.dcm file
-    if path.is_dir():
-        plan_files = list(path.glob('RN*.dcm')) + \
-            list(path.glob('*.pld')) + list(path.glob('*.rst'))
-        if not plan_files:
-            raise FileNotFoundError(
-                f"No plan files found in directory: {path}")
-        if len(plan_files) > 1:
-            logger.warning(
-                f"Multiple plan files found in directory: {path}. Using the first one.")
-        path = plan_files[0]
+    path = _find_plan_file(path)
 
     suffix = path.suffix.lower()
     if suffix == '.pld':
@@ -35,3 +25,42 @@ def load_plan(path: Path, **kwargs) -> Plan:
         return load_plan_rst(path, **kwargs)
     else:
         raise ValueError(f"Unsupported plan file format: {suffix}")
+
+
+def load_plan_header(path: Path, **kwargs) -> Plan:
+    """
+    Load only the plan and field metadata where the format allows it, and return a Plan object.
+    For PLD files the layers are not read, other formats are loaded completely.
+    """
+    path = _find_plan_file(path)
+    if path.suffix.lower() == '.pld':
+        return load_plan_header_pld(path, **kwargs)
+    return load_plan(path, **kwargs)
+
+
+def _find_plan_file(path: Path) -> Path:
+    """
+    Return path itself, or the plan file to use if path is a directory.
+    """
+    # if path is a directory, look for a RN*.dcm file
+    if path.is_dir():
+        # classify the directory entries in a single pass, RTPLAN files take precedence over PLD and RST
+        rn_files, pld_files, rst_files = [], [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('RN') and name.endswith('.dcm'):
+                    rn_files.append(Path(entry.path))
+                elif name.endswith('.pld'):
+                    pld_files.append(Path(entry.path))
+                elif name.endswith('.rst'):
+                    rst_files.append(Path(entry.path))
+        plan_files = rn_files + pld_files + rst_files
+        if not plan_files:
+            raise FileNotFoundError(
+                f"No plan files found in directory: {path}")
+        if len(plan_files) > 1:
+            logger.warning(
+                f"Multiple plan files found in directory: {path}. Using the first one.")
+        path = plan_files[0]
+    return path
@@ -1,27 +1,40 @@
-import copy
 import logging
+from dataclasses import replace
 # from attr import ib
 import numpy as np
 from pathlib import Path
 
-from dicomexport.model_plan import Plan, Field, Layer, Spot, RangeShifter, RS_CATALOG
+from dicomexport.model_plan import Plan, Field, Layer, RangeShifter, RS_CATALOG, SPOT_DTYPE
+
+try:
+    import pydicom as dicom
+    from pydicom.datadict import dictionary_VR
+except ImportError:
+    dicom = None
 
 logger = logging.getLogger(__name__)
 
+# top level attributes read from an RTPLAN, everything else is skipped by the parser
+_PLAN_TAGS = [
+    'Modality', 'SOPClassUID', 'SOPInstanceUID',
+    'PatientID', 'PatientName', 'RTPlanLabel', 'RTPlanDate',
+    'FractionGroupSequence', 'IonBeamSequence',
+]
+
+# numpy types of the DICOM floating point value representations
+_FLOAT_VR = {"FL": np.float32, "FD": np.float64}
+
 
 def load_plan_dicom(file_dcm: Path) -> Plan:
     """Load DICOM RTPLAN."""
 
     p = Plan()
-    try:
-        import pydicom as dicom
-
-    except ImportError:
+    if dicom is None:
         logger.error("pydicom is not installed, cannot read DICOM files.")
         logger.error(
             "Please install pymchelper[dicom] or pymchelper[all] to us this feature.")
         return p
-    d = dicom.dcmread(file_dcm)
+    d = dicom.dcmread(file_dcm, specific_tags=_PLAN_TAGS)
 
     # Check if the file is an RTPLAN
     if d.Modality != "RTPLAN":
@@ -37,7 +50,7 @@ def load_plan_dicom(file_dcm: Path) -> Plan:
 
     # optional attributes that may not be present in all RTPLAN files and can default to empty strings
     p.patient_id = getattr(d, 'PatientID', '')
-    p.patient_name = getattr(d, 'PatientName', '')
+    p.patient_name = str(getattr(d, 'PatientName', ''))  # plain str, do not keep the PersonName object
     p.patient_initials = getattr(d, 'PatientInitials', '')
     p.patient_firstname = getattr(d, 'PatientFirstName', '')
     p.plan_label = getattr(d, 'RTPlanLabel', '')
@@ -75,13 +88,12 @@ def load_plan_dicom(file_dcm: Path) -> Plan:
         n_layers = int(ibm['NumberOfControlPoints'].value) // 2
         myfield.meterset_weight_final = float(
             ibm['FinalCumulativeMetersetWeight'].value)
-        myfield.meterset_per_weight = myfield.cum_mu / myfield.meterset_weight_final
+        meterset_per_weight = myfield.cum_mu / myfield.meterset_weight_final  # local copy for the layer loop
+        myfield.meterset_per_weight = meterset_per_weight
 
         icps = ibm['IonControlPointSequence']  # layers for given field number
         logger.debug("Found %i layers in field number %i", n_layers, field_nr)
 
-        cmu = 0.0
-
         # If range shifters are present, build the RS lookup dictionary
         logger.debug(
             "Checking for Range Shifter Sequence in field number %i", field_nr)
@@ -95,76 +107,64 @@ def load_plan_dicom(file_dcm: Path) -> Plan:
         layer_nr = 1
         logger.debug(f"Processing field number: {field_nr}")
 
-        # init some values which may only be changed once or not at all.
+        # Geometry attributes are only given in the first ion control point and are read once per field.
+        # Varying them per control point (e.g. arc therapy) is not supported by the exporters,
+        # which take the geometry from the first layer of a field, see TopasText.variables().
+        icp0 = icps[0]
         sad_x = 0.0
         sad_y = 0.0
-        snout_position = 0.0
+        if 'LateralSpreadingDeviceSettingsSequence' in icp0:
+            lss = icp0['LateralSpreadingDeviceSettingsSequence']
+            if len(lss.value) != 2:
+                logger.error("LateralSpreadingDeviceSettingsSequence should contain exactly 2 elements, found %d.",
+                             len(lss.value))
+                raise ValueError(
+                    "Invalid LateralSpreadingDeviceSettingsSequence in DICOM plan.")
+
+            sad_x = float(
+                lss[0]['IsocenterToLateralSpreadingDeviceDistance'].value)
+            sad_y = float(
+                lss[1]['IsocenterToLateralSpreadingDeviceDistance'].value)
+
+            logger.debug("Set Lateral spreading device distances: X = %.2f mm, Y = %.2f mm",
+                         sad_x, sad_y)
+
+        snout_position = float(icp0['SnoutPosition'].value) if 'SnoutPosition' in icp0 else 0.0
+
         isocenter = (0.0, 0.0, 0.0)
-        gantry_angle = 0.0
-        couch_angle = 0.0
+        if 'IsocenterPosition' in icp0:
+            isocenter = tuple(float(v)
+                              for v in icp0['IsocenterPosition'].value)
+            # check that length is 3.
+            if len(isocenter) != 3:
+                logger.error(
+                    "IsocenterPosition must have exactly 3 values, found %d in the first control point",
+                    len(isocenter))
+                raise ValueError(
+                    "Invalid DICOM plan: IsocenterPosition has incorrect number of values.")
+
+        gantry_angle = float(icp0['GantryAngle'].value) if 'GantryAngle' in icp0 else 0.0
+        couch_angle = float(icp0['PatientSupportAngle'].value) if 'PatientSupportAngle' in icp0 else 0.0
+
+        # init some values which may be changed by any control point.
         energy = 0.0
         size_x = 0.0  # dicom values are in FWHM mm, but will be ignored, if beam model is available.
         size_y = 0.0
 
         for icp_index, icp in enumerate(icps):
             logger.debug(f"  Processing control point index: {icp_index}")
-            # Several attributes are only set once at the first ion control point.
-            # The strategy here is then to still set them for every layer, even if they do not change.
-            # This is to ensure that the field object has all necessary attributes set.
-            # But also enables future stuff like arc therapy, where these values may change per layer.
-            if 'LateralSpreadingDeviceSettingsSequence' in icp:
-                if len(icp['LateralSpreadingDeviceSettingsSequence'].value) != 2:
-                    logger.error("LateralSpreadingDeviceSettingsSequence should contain exactly 2 elements, found %d.",
-                                 len(ibm['LateralSpreadingDeviceSettingsSequence'].value))
-                    raise ValueError(
-                        "Invalid LateralSpreadingDeviceSettingsSequence in DICOM plan.")
-
-                lss = icp['LateralSpreadingDeviceSettingsSequence']
-                sad_x = float(
-                    lss[0]['IsocenterToLateralSpreadingDeviceDistance'].value)
-                sad_y = float(
-                    lss[1]['IsocenterToLateralSpreadingDeviceDistance'].value)
-
-                logger.debug("Set Lateral spreading device distances: X = %.2f mm, Y = %.2f mm",
-                             sad_x, sad_y)
-
-            # check snout position
-            if 'SnoutPosition' in icp:
-                snout_position = float(icp['SnoutPosition'].value)
 
             if 'RangeShifterSettingsSequence' in icp:
                 for rss in icp['RangeShifterSettingsSequence']:
                     if getattr(rss, 'RangeShifterSetting', None) == "IN":
-                        # lookup range shifter by number, and make a copy of it
+                        # lookup range shifter by number, and make a copy of it with the remaining attributes set
                         _rs_number = rss['ReferencedRangeShifterNumber'].value
                         _rs = rs_dict[_rs_number]
-                        myfield.range_shifter = copy.deepcopy(_rs)
-                        # set remaining attributes
-                        myfield.range_shifter.is_inserted = True
-                        myfield.range_shifter.water_equivalent_thickness = rss.get(
-                            'WaterEquivalentThickness', 0.0)
-                        myfield.range_shifter.isocenter_distance = rss.get(
-                            'IsocenterToRangeShifterDistance', 0.0)
-
-            # isocenter position and gantry counch angles are stored in each layer,
-            # for now we assume they are the same for all layers in a field,
-            # ideally these attributes should be stored in the layer object
-            # then conversion can change it to a field level for topas export.
-            if 'IsocenterPosition' in icp:
-                isocenter = tuple(float(v)
-                                  for v in icp['IsocenterPosition'].value)
-                # check that length is 3.
-                if len(isocenter) != 3:
-                    logger.error(
-                        "IsocenterPosition must have exactly 3 values, found %d in control point index %i",
-                        len(isocenter), icp_index)
-                    raise ValueError(
-                        "Invalid DICOM plan: IsocenterPosition has incorrect number of values.")
-
-            if 'GantryAngle' in icp:
-                gantry_angle = float(icp['GantryAngle'].value)
-            if 'PatientSupportAngle' in icp:
-                couch_angle = float(icp['PatientSupportAngle'].value)
+                        myfield.range_shifter = replace(
+                            _rs,
+                            is_inserted=True,
+                            water_equivalent_thickness=rss.get('WaterEquivalentThickness', 0.0),
+                            isocenter_distance=rss.get('IsocenterToRangeShifterDistance', 0.0))
 
             # Nominal beam energy seems to be a special case, which can be set in
             # every control point, even if it does not change, or it can be set once
@@ -186,18 +186,14 @@ def load_plan_dicom(file_dcm: Path) -> Plan:
                 raise ValueError(
                     "Invalid DICOM plan: NumberOfScanSpotPositions missing.")
 
-            if 'ScanSpotPositionMap' in icp:  # Extract spot MU and scale [MU]
-                pos = np.array(
-                    icp['ScanSpotPositionMap'].value).reshape(nspots, 2)
-            else:
+            if 'ScanSpotPositionMap' not in icp:
                 logger.error(
                     "ScanSpotPositionMap not found in control point index %i", icp_index)
                 raise ValueError(
                     "Invalid DICOM plan: ScanSpotPositionMap missing.")
 
             if 'ScanSpotMetersetWeights' in icp:
-                mu = np.array(icp['ScanSpotMetersetWeights'].value).reshape(
-                    nspots) * myfield.meterset_per_weight
+                weights = _float_array(icp, 'ScanSpotMetersetWeights').reshape(nspots)
             else:
                 logger.error(
                     "ScanSpotMetersetWeights not found in control point index %i", icp_index)
@@ -210,37 +206,57 @@ def load_plan_dicom(file_dcm: Path) -> Plan:
 
             logger.debug(
                 "Found %i spots in layer number %i at energy %f", nspots, layer_nr, energy)
-            nrepaint = int(icp['NumberOfPaintings'].value)  # number of spots
 
-            spots = [Spot(x=x, y=y, mu=mu_val, size_x=size_x, size_y=size_y)
-                     for (x, y), mu_val in zip(pos, mu)]
-
-            # only append layer, if sum of mu are larger than 0
-            sum_mu = np.sum(mu)
-
-            if sum_mu > 0.0:
-                cmu += sum_mu
-                myfield.layers.append(Layer(
-                    spots=spots,
-                    energy_nominal=energy,
-                    energy_measured=energy,
-                    espread=espread,
-                    cum_mu=cmu,
-                    repaint=nrepaint,
-                    mu_to_part_coef=0.0,
-                    isocenter=isocenter,
-                    gantry_angle=gantry_angle,
-                    couch_angle=couch_angle,
-                    snout_position=snout_position,
-                    sad=(sad_x, sad_y),
-                    number=layer_nr
-                ))
-                layer_nr += 1
-            else:
+            # only append layer, if sum of mu are larger than 0.
+            # Check the raw weights first, so empty layers are skipped before building any arrays.
+            if weights.sum() * meterset_per_weight <= 0.0:
                 logger.debug("Skipping empty layer index %i", icp_index)
+                continue
+
+            mu = weights * meterset_per_weight  # Extract spot MU and scale [MU]
+            pos = _float_array(icp, 'ScanSpotPositionMap').reshape(nspots, 2)
+            nrepaint = int(icp['NumberOfPaintings'].value)  # number of spots
+
+            spots = np.empty(nspots, dtype=SPOT_DTYPE)
+            spots["x"] = pos[:, 0]
+            spots["y"] = pos[:, 1]
+            spots["mu"] = mu
+            spots["size_x"] = size_x
+            spots["size_y"] = size_y
+
+            myfield.layers.append(Layer(
+                spots_array=spots,
+                energy_nominal=energy,
+                energy_measured=energy,
+                espread=espread,
+                cum_mu=float(np.sum(mu)),  # MU of this layer
+                repaint=nrepaint,
+                mu_to_part_coef=0.0,
+                isocenter=isocenter,
+                gantry_angle=gantry_angle,
+                couch_angle=couch_angle,
+                snout_position=snout_position,
+                sad=(sad_x, sad_y),
+                number=layer_nr
+            ))
+            layer_nr += 1
     return p
 
 
+def _float_array(ds, keyword: str) -> np.ndarray:
+    """
+    Return a multi-valued FL/FD attribute as a float64 array.
+    If pydicom has not decoded the element yet, the raw bytes are read directly with np.frombuffer.
+    """
+    elem = ds.get_item(keyword)
+    if isinstance(elem.value, bytes):
+        vr = elem.VR or dictionary_VR(keyword)
+        if vr in _FLOAT_VR:
+            dtype = np.dtype(_FLOAT_VR[vr]).newbyteorder("<" if elem.is_little_endian else ">")
+            return np.frombuffer(elem.value, dtype=dtype).astype(np.float64)
+    return np.asarray(ds[keyword].value, dtype=np.float64)
+
+
 def _build_range_shifter(rs_item) -> RangeShifter:
     if 'RangeShifterNumber' not in rs_item:
         raise ValueError("RangeShifterNumber not found in DICOM plan")
@@ -253,10 +269,10 @@ def _build_range_shifter(rs_item) -> RangeShifter:
     rs_type = str(rs_item['RangeShifterType'].value) if 'RangeShifterType' in rs_item else ""
 
     # pattern matching is intentionally case-sensitive to IDs are used in practice
-    if rs_id not in RS_CATALOG:
+    spec = RS_CATALOG.get(rs_id)
+    if spec is None:
         raise ValueError(f"Unknown RangeShifterID '{rs_id}' encountered")
 
-    spec = RS_CATALOG[rs_id]
     return RangeShifter(
         id=rs_id,
         number=number,
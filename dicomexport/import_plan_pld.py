@@ -1,12 +1,27 @@
 import logging
 from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
 
 from dicomexport.beam_model import get_fwhm
-from dicomexport.model_plan import Plan, Field, Layer, Spot
+from dicomexport.model_plan import Plan, Field, Layer, SPOT_DTYPE
 
 logger = logging.getLogger(__name__)
 
 
+def load_plan_header_pld(file_pld: Path, scaling=1.0) -> Plan:
+    """
+    Load only the plan and field metadata of a IBA-style PLD-file.
+
+    Only the first line is read, the single field of the returned plan has no layers.
+    Use load_plan_pld() to read the spots as well.
+    """
+    with file_pld.open() as fh:
+        current_plan, _ = _new_plan(fh.readline(), scaling)
+    return current_plan
+
+
 def load_plan_pld(file_pld: Path, scaling=1.0) -> Plan:
     """
     Load a IBA-style PLD-file.
@@ -17,10 +32,49 @@ def load_plan_pld(file_pld: Path, scaling=1.0) -> Plan:
     logging.warning("IBA_PLD reader not tested yet.")
     eps = 1.0e-10
 
+    espread = 0.0  # will be set by beam model
+
+    # stream the file line by line, only the Element lines of the current layer are kept in memory
+    with file_pld.open() as fh:
+        # First line in PLD file contains both plan and field data
+        current_plan, n_layers = _new_plan(fh.readline(), scaling)
+        myfield = current_plan.fields[0]
+
+        # Single pass over the remaining lines: a "Layer" line starts a new layer,
+        # the "Element" lines directly following it hold its spots.
+        layer_line = None
+        elements: List[str] = []
+        collecting = False
+        for line in fh:
+            if line.startswith("Layer"):
+                if layer_line is not None:
+                    myfield.layers.append(_make_layer(layer_line, elements, espread, eps, len(myfield.layers)))
+                layer_line = line
+                elements = []
+                collecting = True
+            elif collecting and line.startswith("Element"):
+                elements.append(line)
+            else:
+                collecting = False
+        if layer_line is not None:
+            myfield.layers.append(_make_layer(layer_line, elements, espread, eps, len(myfield.layers)))
+
+    logger.info("Read %d layers from %s", len(myfield.layers), file_pld.name)
+
+    if len(myfield.layers) != n_layers:
+        logger.warning("Expected %d layers, but found %d", n_layers, len(myfield.layers))
+
+    return current_plan
+
+
+def _new_plan(header_line: str, scaling: float) -> Tuple[Plan, int]:
+    """
+    Create a Plan with a single empty Field from the first line of a PLD file.
+    Returns the plan and the number of layers announced in the header.
+    """
     current_plan = Plan()
     myfield = Field()  # avoid collision with dataclasses.field
     current_plan.fields = [myfield]
-    current_plan.n_fields = 1
 
     # # TODO: needs beam model to be applied for spot parameters and MU scaling.
     # # For now, we simply assume a constant factor for the number of particles per MU (which is not correct).
@@ -32,94 +86,83 @@ def load_plan_pld(file_pld: Path, scaling=1.0) -> Plan:
     # current_plan.scaling = scaling
     # myfield.scaling = scaling
 
-    pldlines = file_pld.read_text().split('\n')
-    pldlen = len(pldlines)
-    logger.info("Read %d lines of data.", pldlen)
-
     myfield.layers = []
 
-    # First line in PLD file contains both plan and field data
-    tokens = pldlines[0].split(",")
+    n_layers = _parse_header(header_line, current_plan, myfield)
+    return current_plan, n_layers
+
+
+def _parse_header(header_line: str, current_plan: Plan, myfield: Field) -> int:
+    """
+    Set the plan and field metadata from the first line of a PLD file.
+    Returns the number of layers announced in the header.
+    """
+    tokens = header_line.split(",")
     current_plan.patient_id = tokens[1].strip()
     current_plan.patient_name = tokens[2].strip()
-    current_plan.patient_initals = tokens[3].strip()
+    current_plan.patient_initials = tokens[3].strip()
     current_plan.patient_firstname = tokens[4].strip()
     current_plan.plan_label = tokens[5].strip()
     current_plan.beam_name = tokens[6].strip()
     # total amount of MUs in this field
-    myfield.cmu = float(tokens[7].strip())
+    myfield.cum_mu = float(tokens[7].strip())
     myfield.pld_csetweight = float(tokens[8].strip())
-    myfield.n_layers = int(tokens[9].strip())       # number of layers
+    return int(tokens[9].strip())       # number of layers
 
-    espread = 0.0  # will be set by beam model
 
-    i = 1
-    while i < pldlen:
-        line = pldlines[i]
-        if "Layer" in line:
-            tokens = line.split(",")
-
-            spotsize_sigma = float(tokens[1].strip())
-            spotsize_fwhm = get_fwhm(spotsize_sigma)  # single value in mm
-
-            energy_nominal = float(tokens[2].strip())
-            cmu = float(tokens[3].strip())
-            nspots_expected = int(tokens[4].strip())
-
-            nrepaint = int(tokens[5].strip()) if len(tokens) > 5 else 0
-
-            elements = []
-            j = i + 1
-            while j < pldlen and "Element" in pldlines[j]:
-                elements.append(pldlines[j])
-                j += 1
-
-            spots = []
-            for el in elements:
-                el_tokens = el.split(",")
-                _x = float(el_tokens[1].strip())
-                _y = float(el_tokens[2].strip())
-                _mu = float(el_tokens[3].strip())
-
-                if abs(_x) < eps:
-                    _x = 0.0
-                if abs(_y) < eps:
-                    _y = 0.0
-                if _mu < eps:
-                    _mu = 0.0
-
-                # Skip empty spots
-                if _mu > 0.0:
-                    spots.append(Spot(
-                        x=_x,
-                        y=_y,
-                        mu=_mu,
-                        size_x=spotsize_fwhm,
-                        size_y=spotsize_fwhm
-                    ))
-
-            # check if expected number of spots is correct
-            if len(spots) != nspots_expected:
-                logger.warning("Expected %d spots, but found %d in layer %d at energy %.2f MeV",
-                               nspots_expected, len(spots), len(myfield.layers), energy_nominal)
-
-            layer = Layer(
-                spots=spots,
-                energy_nominal=energy_nominal,
-                energy_measured=energy_nominal,
-                espread=espread,
-                cum_mu=cmu,
-                n_spots=len(spots),
-                repaint=nrepaint,
-                mu_to_part_coef=0.0  # to be set by beam model later
-            )
-
-            current_plan.fields[0].layers.append(layer)
-            logger.debug("Appended layer %d with %d spots", len(
-                current_plan.fields[0].layers), len(spots))
-
-            i = j  # move to next layer or EOF
-        else:
-            i += 1
+def _make_layer(layer_line: str, elements: List[str], espread: float, eps: float, layer_index: int) -> Layer:
+    """
+    Build a Layer from its "Layer,..." header line and its "Element,..." lines.
+    """
+    tokens = layer_line.split(",")
 
-    return current_plan
+    spotsize_sigma = float(tokens[1].strip())
+    spotsize_fwhm = get_fwhm(spotsize_sigma)  # single value in mm
+
+    energy_nominal = float(tokens[2].strip())
+    cmu = float(tokens[3].strip())
+    nspots_expected = int(tokens[4].strip())
+
+    nrepaint = int(tokens[5].strip()) if len(tokens) > 5 else 0
+
+    spots = _parse_elements(elements, spotsize_fwhm, eps)
+
+    # check if expected number of spots is correct
+    if len(spots) != nspots_expected:
+        logger.warning("Expected %d spots, but found %d in layer %d at energy %.2f MeV",
+                       nspots_expected, len(spots), layer_index, energy_nominal)
+
+    logger.debug("Appended layer %d with %d spots", layer_index + 1, len(spots))
+    return Layer(
+        spots_array=spots,
+        energy_nominal=energy_nominal,
+        energy_measured=energy_nominal,
+        espread=espread,
+        cum_mu=cmu,
+        repaint=nrepaint,
+        mu_to_part_coef=0.0  # to be set by beam model later
+    )
+
+
+def _parse_elements(elements: List[str], spotsize_fwhm: float, eps: float = 1.0e-10) -> np.ndarray:
+    """
+    Parse the "Element,x,y,mu,..." lines of a PLD layer into a SPOT_DTYPE array.
+    Coordinates and MU below eps are set to zero, spots without MU are skipped.
+    """
+    if not elements:
+        return np.empty(0, dtype=SPOT_DTYPE)
+    arr = np.loadtxt(elements, delimiter=",", usecols=(1, 2, 3), ndmin=2)
+    xy = arr[:, :2]
+    xy[np.abs(xy) < eps] = 0.0
+    mu = arr[:, 2]
+    mu[mu < eps] = 0.0
+
+    # Skip empty spots
+    arr = arr[mu > 0.0]
+    spots = np.empty(len(arr), dtype=SPOT_DTYPE)
+    spots["x"] = arr[:, 0]
+    spots["y"] = arr[:, 1]
+    spots["mu"] = arr[:, 2]
+    spots["size_x"] = spotsize_fwhm
+    spots["size_y"] = spotsize_fwhm
+    return spots
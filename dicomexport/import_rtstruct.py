@@ -1,13 +1,19 @@
 import pydicom
 import logging
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from dicomexport.model_rtstruct import RTStruct, RTStructROI
 
 
 logger = logging.getLogger(__name__)
 
+# top level attributes read from an RTSTRUCT, everything else is skipped by the parser
+_RS_TAGS = [
+    "Modality", "PatientID", "PatientName", "FrameOfReferenceUID",
+    "StructureSetROISequence", "ROIContourSequence",
+]
+
 
 def load_rs(rtstruct_path: Path) -> RTStruct:
     """
@@ -30,7 +36,8 @@ def load_rs(rtstruct_path: Path) -> RTStruct:
                 f"RTSTRUCT file not found: {rtstruct_path}")
         rtstruct_file = rtstruct_path
 
-    ds = pydicom.dcmread(rtstruct_file)
+    # contour data are never used, defer reading large values such as ContourData
+    ds = pydicom.dcmread(rtstruct_file, specific_tags=_RS_TAGS, defer_size="1 KB")
 
     # Check if the file is an RTSTRUCT
     if ds.Modality != "RTSTRUCT":
@@ -39,43 +46,37 @@ def load_rs(rtstruct_path: Path) -> RTStruct:
 
     # --- Basic patient info ---
     patient_id = ds.get("PatientID", "")
-    patient_name = ds.get("PatientName", "")
+    patient_name = str(ds.get("PatientName", ""))
     patient_firstname = ds.get("PatientFirstName", "")
     patient_initials = ds.get("PatientInitials", "")
 
     # --- Frame of Reference UID ---
-    frame_of_reference_uid = getattr(ds, "FrameOfReferenceUID", None)
+    frame_of_reference_uid = ds.get("FrameOfReferenceUID", None)
     if not frame_of_reference_uid:
         raise ValueError(
             "RTSTRUCT missing FrameOfReferenceUID, required for geometry consistency checks.")
 
     # --- Parse ROIs ---
-    rois: List[RTStructROI] = []
-
-    # Build ROI name/number map from StructureSetROISequence
-    roi_name_map = {}
+    # Build the ROIs keyed by number from StructureSetROISequence, default color is white
+    rois_by_number: Dict[int, RTStructROI] = {}
     for roi in ds.StructureSetROISequence:
         roi_number = int(roi.ROINumber)
-        roi_name = str(roi.ROIName)
-        roi_name_map[roi_number] = roi_name
-
-    # Parse colors if available
-    color_map = {}
-    if hasattr(ds, "ROIContourSequence"):
-        for roi_contour in ds.ROIContourSequence:
-            roi_number = int(roi_contour.ReferencedROINumber)
-            if hasattr(roi_contour, "ROIDisplayColor"):
-                color_map[roi_number] = tuple(int(c)
-                                              for c in roi_contour.ROIDisplayColor)
-
-    # Assemble ROIs
-    for roi_number, roi_name in roi_name_map.items():
-        color = color_map.get(roi_number, (255, 255, 255))  # Default white
-        rois.append(RTStructROI(
-            roi_name=roi_name,
+        rois_by_number[roi_number] = RTStructROI(
+            roi_name=str(roi.ROIName),
             roi_number=roi_number,
-            rgb_color=color
-        ))
+            rgb_color=(255, 255, 255)
+        )
+
+    # Set colors if available
+    for roi_contour in ds.get("ROIContourSequence", []):
+        color = roi_contour.get("ROIDisplayColor", None)
+        if color is None:
+            continue
+        roi = rois_by_number.get(int(roi_contour.ReferencedROINumber))
+        if roi is not None:
+            roi.rgb_color = (int(color[0]), int(color[1]), int(color[2]))
+
+    rois: List[RTStructROI] = list(rois_by_number.values())
 
     logger.info(
         f"Imported RTSTRUCT: {rtstruct_path.name} with {len(rois)} ROIs")
@@ -4,7 +4,7 @@ import logging
 from pathlib import Path
 
 from dicomexport.parser_main import create_parser
-from dicomexport.beam_model import BeamModel
+from dicomexport.beam_model import load_beam_model
 from dicomexport.import_ct import load_ct
 from dicomexport.import_rtstruct import load_rs
 from dicomexport.import_plan import load_plan
@@ -45,13 +45,13 @@ def main(args=None) -> int:
 
     # load the CT files
     study_dir = parsed_args.study_dir
-    ct = load_ct(study_dir)
+    ct = load_ct(study_dir, workers=parsed_args.workers)
     ct.spr_to_material_path = parsed_args.spr_to_material_path
 
     rs = load_rs(study_dir)
-    bm = BeamModel(parsed_args.bm,
-                   nominal=True,
-                   beam_model_position=parsed_args.beam_model_position)
+    bm = load_beam_model(parsed_args.bm,
+                         nominal=True,
+                         beam_model_position=parsed_args.beam_model_position)
 
     pn = load_plan(study_dir)
     pn.beam_model = bm
@@ -65,7 +65,8 @@ def main(args=None) -> int:
                            parsed_args.output_base_path,
                            field_nr=parsed_args.field_nr,
                            dose_path=rd_path,
-                           nstat=parsed_args.nstat)
+                           nstat=parsed_args.nstat,
+                           workers=parsed_args.workers)
     elif parsed_args.export_fmt == 'phasespace':
         logger.error("Phasespace export is not implemented yet in this build.")
         # Later: call your MCPL exporter here.
@@ -2,8 +2,8 @@ import sys
 import logging
 
 from dicomexport.parser_plan_export import create_parser
-from dicomexport.beam_model import BeamModel
-from dicomexport.import_plan import load_plan
+from dicomexport.beam_model import load_beam_model
+from dicomexport.import_plan import load_plan, load_plan_header
 from dicomexport.export_plan import export_plan
 
 logger = logging.getLogger(__name__)
@@ -31,23 +31,25 @@ def main(args=None) -> int:
     # set nominal/actual energy lookup mode
     param_nominal = not parsed_args.actual
 
-    # load the plan
-    pln = load_plan(parsed_args.fin)
-
     if parsed_args.diag:
+        # diagnostics only need the plan metadata, the layers of a PLD file are not read
+        pln = load_plan_header(parsed_args.fin)
         print("Plan diagnostics:")
         print(pln)
         return 0
 
+    # load the plan
+    pln = load_plan(parsed_args.fin)
+
     # Next, load the beam model.
     if not parsed_args.fbm:
         logger.error(
             "No beam model provided. Use -b to specify a beam model CSV file.")
         raise ValueError("Beam model file is required.")
 
-    pln.beam_model = BeamModel(parsed_args.fbm,
-                               nominal=not parsed_args.actual,
-                               beam_model_position=parsed_args.beam_model_position)
+    pln.beam_model = load_beam_model(parsed_args.fbm,
+                                     nominal=not parsed_args.actual,
+                                     beam_model_position=parsed_args.beam_model_position)
     logger.debug("Applying beam model to plan...")
     pln.apply_beammodel()
 
@@ -56,7 +58,8 @@ def main(args=None) -> int:
                 field_nr=parsed_args.field_nr,
                 nominal=param_nominal,
                 nstat=parsed_args.nstat,
-                fmt=parsed_args.export_fmt)
+                fmt=parsed_args.export_fmt,
+                workers=parsed_args.workers)
 
     return 0
 
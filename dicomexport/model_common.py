@@ -0,0 +1,4 @@
+import sys
+
+# model classes use __slots__ where dataclasses support it (Python >= 3.10)
+DATACLASS_KW = {"slots": True} if sys.version_info >= (3, 10) else {}
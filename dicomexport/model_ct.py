@@ -2,32 +2,32 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
+import numpy as np
 
-@dataclass
+from dicomexport.model_common import DATACLASS_KW
+
+
+@dataclass(**DATACLASS_KW)
 class Image:
     """
     A single image in a CT scan.
 
     Attributes:
-        pixel_data: The pixel data of the image.
         instance_number: The instance number of the image.
         sop_instance_uid: The SOP Instance UID of the image.
         sop_class_uid: The SOP Class UID of the image.
     """
-    modality: str = "CT"
-
-    pixel_data: bytes = b""  # pixel data are not needed for the pipeline, but a placeholder is just provided for future use
-
     sop_class_uid: str = ""
     sop_instance_uid: str = ""
     modality: str = ""
     series_description: str = ""
 
-    pixel_spacing: Tuple[float, float] = (0.0, 0.0)
+    # geometry vectors are float64 arrays, left out of __eq__ as arrays do not compare to a single bool
+    pixel_spacing: np.ndarray = field(default_factory=lambda: np.zeros(2), compare=False)
     slice_thickness: float = 0.0
     slice_position: float = 0.0  # will be computed from image position and orientation
-    image_orientation: Tuple[float, float, float, float, float, float] = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
-    image_position_patient: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    image_orientation: np.ndarray = field(default_factory=lambda: np.zeros(6), compare=False)
+    image_position_patient: np.ndarray = field(default_factory=lambda: np.zeros(3), compare=False)
 
     instance_number: int = 0
 
@@ -40,7 +40,7 @@ class Image:
     columns: int = 0
 
 
-@dataclass
+@dataclass(**DATACLASS_KW)
 class CTModel:
     """
     A model for CT data in a proton treatment plan.
@@ -52,6 +52,15 @@ class CTModel:
     dicom_origin: Tuple[float, float, float] = (0.0, 0.0, 0.0)
     spr_to_material_path: Optional[Path] = None  # in fact mandatory as long we depend on the dose cube
 
+    # header data shared by all slices, filled by load_ct through cache_header() once the images are sorted.
+    # Assigning a new image list clears it, after changing the list in place call cache_header() again.
+    _header: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        if name == "images":
+            object.__setattr__(self, "_header", {})
+        object.__setattr__(self, name, value)
+
     # In dicom format, the following data are per image, and could in princple be different
     # from image to image, but we assume they are the same for all images in this model
     # therefore we store them in the CTModel class as well.
@@ -59,22 +68,32 @@ class CTModel:
     # but should this change in the future, we can still adapt the code.
     @property
     def patient_id(self) -> str:
+        if self._header:
+            return self._header["patient_id"]
         return self.images[0].patient_id if self.images else ""
 
     @property
     def patient_name(self) -> str:
+        if self._header:
+            return self._header["patient_name"]
         return self.images[0].patient_name if self.images else ""
 
     @property
     def patient_position(self) -> str:
+        if self._header:
+            return self._header["patient_position"]
         return self.images[0].patient_position if self.images else ""
 
     @property
     def rows(self) -> int:
+        if self._header:
+            return self._header["rows"]
         return self.images[0].rows if self.images else 0
 
     @property
     def columns(self) -> int:
+        if self._header:
+            return self._header["columns"]
         return self.images[0].columns if self.images else 0
 
     @property
@@ -84,12 +103,30 @@ class CTModel:
 
     @property
     def slice_thickness(self) -> float:
-        """Slice thickness of the CT model."""
+        """Slice thickness of the CT model, median distance between neighbouring slice positions."""
+        if self._header:
+            return self._header["slice_thickness"]
         if len(self.images) > 1:
-            return self.images[1].slice_position - self.images[0].slice_position
+            positions = np.sort([img.slice_position for img in self.images])
+            return float(np.median(np.diff(positions)))
         else:
             return 0.0
 
+    def cache_header(self) -> None:
+        """Store the header data shared by all slices, so the properties above do not go through images."""
+        self._header = {}
+        self._header = {
+            "patient_id": self.patient_id,
+            "patient_name": self.patient_name,
+            "patient_position": self.patient_position,
+            "rows": self.rows,
+            "columns": self.columns,
+            "slice_thickness": self.slice_thickness,
+        }
+
+    def clear_header(self) -> None:
+        self._header = {}
+
     def __repr__(self):
         return (
             f"<CTModel patient_id='{self.patient_id}', "
@@ -1,10 +1,11 @@
-import sys
 import logging
-from dataclasses import dataclass, field as dc_field
-from typing import List, Tuple, Optional
-from io import StringIO
+from dataclasses import InitVar, dataclass, field as dc_field
+from typing import Iterable, List, Tuple, Optional
+
+import numpy as np
 
 from dicomexport.beam_model import BeamModel, get_fwhm
+from dicomexport.model_common import DATACLASS_KW
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ RS_CATALOG = {
 }
 
 
-@dataclass
+@dataclass(**DATACLASS_KW)
 class RangeShifter:
     """Range shifter data."""
     id: str = ""
@@ -37,26 +38,39 @@ class RangeShifter:
     water_equivalent_thickness: float = 0.0  # mm
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_KW)
 class Spot:
-    """Single scanned spot in a proton layer."""
+    """Single scanned spot in a proton layer, a read-only view of one row of Layer.spots_array."""
     x: float
     y: float
     mu: float
     size_x: float = 0.0  # FWHM in X
     size_y: float = 0.0  # FWHM in Y
 
-    def __repr__(self):
-        return f"<Spot x={self.x:.2f} y={self.y:.2f} mu={self.mu:.4f}>"
 
+# record layout for the spots of a layer, one field per Spot attribute
+SPOT_DTYPE = np.dtype([
+    ("x", np.float64),
+    ("y", np.float64),
+    ("mu", np.float64),
+    ("size_x", np.float64),
+    ("size_y", np.float64),
+])
+
+
+def spots_to_array(spots: Iterable[Spot]) -> np.ndarray:
+    """Pack Spot objects into a structured array with SPOT_DTYPE."""
+    return np.array([(s.x, s.y, s.mu, s.size_x, s.size_y) for s in spots], dtype=SPOT_DTYPE)
 
-@dataclass
+
+@dataclass(**DATACLASS_KW)
 class Layer:
     """
     A single energy layer in a proton field.
 
     Attributes:
-        spots: List of Spot objects.
+        spots: Init-only list of Spot objects, stored in spots_array.
+        spots_array: Spots of this layer as a structured array with SPOT_DTYPE.
         energy_nominal: Nominal beam energy [MeV].
         energy_measured: Measured energy [MeV].
         espread: Energy spread [MeV].
@@ -75,7 +89,8 @@ class Layer:
         spot_size: FWHM [mm] (set after beam model application).
     """
 
-    spots: List[Spot] = dc_field(default_factory=list)
+    spots: InitVar[Optional[Iterable[Spot]]] = None
+    spots_array: np.ndarray = dc_field(default_factory=lambda: np.empty(0, dtype=SPOT_DTYPE))
     energy_nominal: float = 0.0
     energy_measured: float = 0.0
     espread: float = 0.0
@@ -96,9 +111,34 @@ class Layer:
     number: int = 0  # layer number, starting from 1, only including layers which contain data
     spot_size: Tuple[float, float] = (0.0, 0.0)  # FWHM in (x,y), set after beam model application
 
+    def __post_init__(self, spots: Optional[Iterable[Spot]]) -> None:
+        if spots is not None:
+            self.spots_array = spots_to_array(spots)
+
     @property
     def n_spots(self) -> int:
-        return len(self.spots)
+        return len(self.spots_array)
+
+    # column views into spots_array
+    @property
+    def x(self) -> np.ndarray:
+        return self.spots_array["x"]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.spots_array["y"]
+
+    @property
+    def mu(self) -> np.ndarray:
+        return self.spots_array["mu"]
+
+    @property
+    def size_x(self) -> np.ndarray:
+        return self.spots_array["size_x"]
+
+    @property
+    def size_y(self) -> np.ndarray:
+        return self.spots_array["size_y"]
 
     @property
     def n_particles(self) -> float:
@@ -111,19 +151,19 @@ class Layer:
 
     @property
     def xmin(self) -> float:
-        return min((spot.x for spot in self.spots), default=0.0)
+        return float(self.x.min()) if self.n_spots else 0.0
 
     @property
     def xmax(self) -> float:
-        return max((spot.x for spot in self.spots), default=0.0)
+        return float(self.x.max()) if self.n_spots else 0.0
 
     @property
     def ymin(self) -> float:
-        return min((spot.y for spot in self.spots), default=0.0)
+        return float(self.y.min()) if self.n_spots else 0.0
 
     @property
     def ymax(self) -> float:
-        return max((spot.y for spot in self.spots), default=0.0)
+        return float(self.y.max()) if self.n_spots else 0.0
 
     def __repr__(self):
         lines = []
@@ -146,7 +186,23 @@ class Layer:
         return "\n".join(lines)
 
 
-@dataclass
+def _get_spots(layer: Layer) -> List[Spot]:
+    """
+    Spot objects built from spots_array. This is a new list on every access, changing it does not change
+    the layer, and loops over many spots should use the x, y, mu, ... column views instead.
+    """
+    return [Spot(*row) for row in layer.spots_array.tolist()]
+
+
+def _set_spots(layer: Layer, spots: Iterable[Spot]) -> None:
+    layer.spots_array = spots_to_array(spots)
+
+
+# attached after the class body, since the name "spots" is taken by the init-only field there
+Layer.spots = property(_get_spots, _set_spots, doc=_get_spots.__doc__)
+
+
+@dataclass(**DATACLASS_KW)
 class Field:
     """A field consisting of multiple energy layers."""
 
@@ -242,7 +298,7 @@ class Field:
         return "\n".join(lines)
 
 
-@dataclass
+@dataclass(**DATACLASS_KW)
 class Plan:
     """A proton therapy plan consisting of multiple fields."""
 
@@ -273,39 +329,46 @@ class Plan:
 
     def apply_beammodel(self):
         """Adjust plan to beam model."""
-        if self.beam_model:
-            for myfield in self.fields:
-                for layer in myfield.layers:
-                    # calculate number of particles
-                    layer.mu_to_part_coef = self.beam_model.f_ppmu(
-                        layer.energy_nominal)
-                    logger.debug(
-                        f"Layer {layer.energy_nominal} MeV, MU to particles conversion factor = {layer.mu_to_part_coef:.2f}")
-                    logger.debug(
-                        f"Layer {layer.energy_nominal} MeV, mu_to_part_coef = {layer.mu_to_part_coef:.2f}")
-                    layer.energy_measured = self.beam_model.f_e(
-                        layer.energy_nominal)
-                    layer.espread = self.beam_model.f_espread(
-                        layer.energy_nominal)
-                    layer.spot_size = (
-                        self.beam_model.f_sx(layer.energy_nominal) * get_fwhm(1.0),
-                        self.beam_model.f_sy(layer.energy_nominal) * get_fwhm(1.0)
-                    )
-        else:
+        bm = self.beam_model
+        if not bm:
             logger.error("No beam model set, cannot apply beam model to plan.")
             raise ValueError("No beam model set for plan.")
 
-        # set cumulative sums
+        # evaluate the beam model once for all layer energies in the plan
+        energies = np.fromiter((layer.energy_nominal for myfield in self.fields for layer in myfield.layers),
+                               dtype=np.float64)
+        fwhm_scale = get_fwhm(1.0)  # sigma to FWHM
+        layer_params = zip(
+            bm.f_ppmu(energies),
+            bm.f_e(energies),
+            bm.f_espread(energies),
+            bm.f_sx(energies) * fwhm_scale,
+            bm.f_sy(energies) * fwhm_scale,
+        )
+
         for myfield in self.fields:
+            # set cumulative sums
             myfield.cum_particles = 0.0
             myfield.cum_mu = 0.0
 
             # set layer specific values
             for layer in myfield.layers:
+                # calculate number of particles
+                layer.mu_to_part_coef, layer.energy_measured, layer.espread, fwhm_x, fwhm_y = next(layer_params)
+                layer.spot_size = (fwhm_x, fwhm_y)
+                logger.debug("Layer %s MeV, MU to particles conversion factor = %.2f",
+                             layer.energy_nominal, layer.mu_to_part_coef)
+                logger.debug("Layer %s MeV, mu_to_part_coef = %.2f", layer.energy_nominal, layer.mu_to_part_coef)
+
                 logger.debug("Processing layer with %d spots", layer.n_spots)
                 if layer.n_spots > 0:
-                    mu_list = [spot.mu for spot in layer.spots]
-                    layer.cum_mu = sum(mu_list)
+                    # the layer MU is the sum of the spots kept by the importer, not the
+                    # (possibly rounded) value from the plan file, e.g. a PLD Layer line
+                    spot_mu = float(layer.mu.sum())
+                    if layer.cum_mu > 0.0 and not np.isclose(spot_mu, layer.cum_mu, rtol=1e-4):
+                        logger.warning("Layer %s MeV: MU from plan file %.4f differs from sum of spot MU %.4f",
+                                       layer.energy_nominal, layer.cum_mu, spot_mu)
+                    layer.cum_mu = spot_mu
                     layer.is_empty = False
 
                     myfield.cum_particles += layer.cum_particles
@@ -328,17 +391,6 @@ class Plan:
             lines.append("---------------------------------------------------")
             lines.append(
                 f"   Field                  : {i + 1:02d}/{self.n_fields:02d}:")
-            # Use the field's diagnose method if it returns a string, else str()
-            diagnose_str = getattr(myfield, '__str__', None)
-            if callable(diagnose_str):
-                lines.append(str(myfield))
-            else:
-                # fallback to diagnose() if it prints
-                buf = StringIO()
-                sys_stdout = sys.stdout
-                sys.stdout = buf
-                myfield.diagnose()
-                sys.stdout = sys_stdout
-                lines.append(buf.getvalue().strip())
+            lines.append(str(myfield))
             lines.append("")
         return "\n".join(lines)
@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
 from typing import List, Tuple
 
+from dicomexport.model_common import DATACLASS_KW
 
-@dataclass
+
+@dataclass(**DATACLASS_KW)
 class RTStructROI:
     """
     A model for a single ROI (Region of Interest) in an RT Structure Set.
@@ -15,7 +17,7 @@ class RTStructROI:
     # Contour data are in patient coordinates.
 
 
-@dataclass
+@dataclass(**DATACLASS_KW)
 class RTStruct:
     """
     A model representing an RT Structure Set for proton therapy planning.
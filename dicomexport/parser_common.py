@@ -0,0 +1,12 @@
+import argparse
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type for counts where 0 has a special meaning, such as -j 0 for all cores."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or a positive integer, got {number}")
+    return number
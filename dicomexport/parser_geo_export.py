@@ -1,9 +1,12 @@
 import argparse
+import functools
 from pathlib import Path
 
 from dicomexport.__version__ import __version__
 
 
+# the parser is never modified after construction, so it is built once and shared by all callers
+@functools.lru_cache(maxsize=1)
 def create_parser():
     parser = argparse.ArgumentParser(
         description="Convert DICOM CT and RTSTRUCT files to geometry needed for TOPAS.")
@@ -1,9 +1,13 @@
 import argparse
+import functools
 from pathlib import Path
 
 from dicomexport.__version__ import __version__
+from dicomexport.parser_common import non_negative_int
 
 
+# the parser is never modified after construction, so it is built once and shared by all callers
+@functools.lru_cache(maxsize=1)
 def create_parser():
     parser = argparse.ArgumentParser(
         description="Convert DICOM CT and RTSTRUCT files to geometry needed for TOPAS.")
@@ -35,6 +39,10 @@ def create_parser():
     parser.add_argument('-N', '--nstat', type=int, dest='nstat',
                         help="Target protons for simulation", default=int(1e6))
 
+    parser.add_argument('-j', '--jobs', type=non_negative_int, dest='workers', default=1,
+                        help="Number of processes for reading CT slices and exporting fields in parallel, "
+                        "0 uses all cores (default: 1).")
+
     parser.add_argument(
         '--export-fmt', dest='export_fmt', choices=['topas', 'phasespace', 'racehorse'], default='topas',
         help=("Export format (default: topas). "
@@ -1,9 +1,13 @@
 import argparse
+import functools
 from pathlib import Path
 
 from dicomexport.__version__ import __version__
+from dicomexport.parser_common import non_negative_int
 
 
+# the parser is never modified after construction, so it is built once and shared by all callers
+@functools.lru_cache(maxsize=1)
 def create_parser():
     parser = argparse.ArgumentParser(
         description="Convert DICOM-RT Ion plans to MC-compatible spot lists using a beam model."
@@ -25,6 +29,8 @@ def create_parser():
     parser.add_argument('-s', '--scale', type=float, dest='scale',
                         help="additional scaling multiplier for MC plan", default=1.0)
     parser.add_argument('-N', '--nstat', type=int, dest='nstat', help="Target protons for simulation", default=int(1e6))
+    parser.add_argument('-j', '--jobs', type=non_negative_int, dest='workers', default=1,
+                        help="Number of processes for exporting fields in parallel, 0 uses all cores (default: 1).")
 
     parser.add_argument(
         '--export-fmt', dest='export_fmt', choices=['topas', 'phasespace', 'racehorse'], default='topas',
@@ -1,4 +1,5 @@
 import datetime
+import functools
 import getpass  # used for recording the user who generated the file
 from pathlib import Path
 
@@ -7,26 +8,113 @@ from dicomexport.model_ct import CTModel
 from dicomexport.model_rtstruct import RTStruct
 from dicomexport.__version__ import __version__
 
+_ZERO3 = (0.0, 0.0, 0.0)
+
+# sections without parameters are joined once at import
+_WORLD_SETUP = "\n".join([
+    "##############################################",
+    "###         W O R L D    S E T U P         ###",
+    "##############################################",
+    's:Ge/World/Type            = "TsBox"',
+    's:Ge/World/Material        = "Air"',
+    "d:Ge/World/HLX             = 90. cm",
+    "d:Ge/World/HLY             = 90. cm",
+    "d:Ge/World/HLZ             = 90. cm",
+    'b:Ge/World/Invisible       = "True"',
+    "\n"
+])
+
+_GEOMETRY_GANTRY = "\n".join([
+    "##############################################",
+    "###     G E O M E T R Y   G A N T R Y      ###",
+    "##############################################",
+    's:Ge/Gantry/Parent                   = "DCM_to_IEC"',
+    's:Ge/Gantry/Type                     = "Group"',
+    "d:Ge/Gantry/TransX                   = 0.00 mm",
+    "d:Ge/Gantry/TransY                   = 0.00 mm",
+    "d:Ge/Gantry/TransZ                   = 0.00 mm",
+    "d:Ge/Gantry/RotX                     = 0.00 deg",
+    "d:Ge/Gantry/RotY                     = Ge/gantryAngle deg",
+    "d:Ge/Gantry/RotZ                     = 0.00 deg",
+    "\n"
+])
+
+_GEOMETRY_COUCH = "\n".join([
+    "##############################################",
+    "###      G E O M E T R Y    C O U C H      ###",
+    "##############################################",
+    's:Ge/Couch/Parent                  = "World"',
+    's:Ge/Couch/Type                    = "Group"',
+    "d:Ge/Couch/RotX                    = 0. deg",
+    "d:Ge/Couch/RotY                    = -1.0 * Ge/couchAngle deg",
+    "d:Ge/Couch/RotZ                    = 0. deg",
+    "d:Ge/Couch/TransX                  = 0.0 mm",
+    "d:Ge/Couch/TransY                  = 0.0 mm",
+    "d:Ge/Couch/TransZ                  = 0.0 mm",
+    "\n"
+])
+
+_GEOMETRY_DCM_TO_IEC = "\n".join([
+    "##############################################",
+    "###      G E O M E T R Y    DCM_to_IEC     ###",
+    "##############################################",
+    's:Ge/DCM_to_IEC/Parent               = "Couch"',
+    's:Ge/DCM_to_IEC/Type                 = "Group"',
+    "d:Ge/DCM_to_IEC/TransX               = 0.0 mm",
+    "d:Ge/DCM_to_IEC/TransY               = 0.0 mm",
+    "d:Ge/DCM_to_IEC/TransZ               = 0.0 mm",
+    "d:Ge/DCM_to_IEC/RotX                 = 90.00 deg",
+    "d:Ge/DCM_to_IEC/RotY                 = 0.0 deg",
+    "d:Ge/DCM_to_IEC/RotZ                 = 0.0 deg",
+    "\n"
+])
+
+_FIELD_BEAM_TIMEFEATURE = "\n".join([
+    "##############################################",
+    "###               B  E  A  M               ###",
+    "##############################################",
+    's:So/Field/Type                      = "Emittance"',
+    's:So/Field/Component                 = "BeamPosition"',
+    's:So/Field/BeamParticle              = "proton"',
+    "d:So/Field/BeamEnergy                = Tf/Energy/Value MeV",
+    "u:So/Field/BeamEnergySpread          = Tf/EnergySpread/Value",
+    's:So/Field/Distribution              = "BiGaussian"',
+    "d:So/Field/SigmaX                    = Tf/SigmaX/Value mm",
+    "d:So/Field/SigmaY                    = Tf/SigmaY/Value mm",
+    "u:So/Field/SigmaXprime               = Tf/SigmaXprime/Value",
+    "u:So/Field/SigmaYprime               = Tf/SigmaYprime/Value",
+    "u:So/Field/CorrelationX              = Tf/CorrelationX/Value",
+    "u:So/Field/CorrelationY              = Tf/CorrelationY/Value",
+    "",
+    "i:So/Field/NumberOfHistoriesInRun    = Tf/spotWeight/Value",
+    "\n"
+])
+
 
 class TopasText:
     @staticmethod
     def header(field: Field, nstat_scale: float, nstat: int) -> str:
-        lines = [
-            f"# Topas input file for field {field.number}",
-            '# ' + '-' * 40,
-            f"# SOP_INSTANCE_UID {field.sop_instance_uid}",
-            "# ",
-            f"# TOTAL_NUMBER_OF_PARTICLES: {field.n_particles:.0f}",
-            f"# TOTAL_MU: {field.cum_mu:.2f}",
-            f"# REQUESTED_HISTORIES: {nstat:.0f}",
-            f"# PARTICLE_SCALING: {nstat_scale:.2f}",
+        return (
+            f"# Topas input file for field {field.number}\n"
+            "# ----------------------------------------\n"
+            f"# SOP_INSTANCE_UID {field.sop_instance_uid}\n"
+            "# \n"
+            f"# TOTAL_NUMBER_OF_PARTICLES: {field.n_particles:.0f}\n"
+            f"# TOTAL_MU: {field.cum_mu:.2f}\n"
+            f"# REQUESTED_HISTORIES: {nstat:.0f}\n"
+            f"# PARTICLE_SCALING: {nstat_scale:.2f}\n"
             "#\n"
-        ]
-        return "\n".join(lines)
+        )
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def header2() -> str:
-        "Add a footer to the topas file with generation date and username."
+        """
+        Add a footer to the topas file with generation date and username.
+
+        Built once per process, so all fields written by the same process share the same timestamp;
+        with parallel export (-j) each worker process records its own.
+        """
 
         lines = [
             f"# Generated {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} by user '{getpass.getuser()}'",
@@ -53,31 +141,32 @@ class TopasText:
         # Extract isocenter, gantry, couch, and snout_position from the first layer
         # varying isocenter, gantry, couch, snout_position per controlpoint is not supported.
         layer = myfield.layers[0]
-        isocenter = getattr(layer, "isocenter", [0.0, 0.0, 0.0])
-        gantry_angle = getattr(layer, "gantry_angle", 0.0)
-        couch_angle = getattr(layer, "couch_angle", 0.0)
-        dicom_origin = getattr(layer, "dicom_origin", [0.0, 0.0, 0.0])
-        snout_position = getattr(layer, "snout_position", 421.0)
-
-        lines = [
-            "##############################################",
-            "###           V A R I A B L E S            ###",
-            "##############################################",
-            "",
-            f"d:Rt/Plan/IsoCenterX                 = {isocenter[0]:.2f} mm",
-            f"d:Rt/Plan/IsoCenterY                 = {isocenter[1]:.2f} mm",
-            f"d:Rt/Plan/IsoCenterZ                 = {isocenter[2]:.2f} mm",
-            f"d:Ge/snoutPosition                   = {snout_position:.2f} mm",
-            f"d:Ge/gantryAngle                     = {gantry_angle:.2f} deg",
-            f"d:Ge/couchAngle                      = {couch_angle:.2f} deg",
-            f"dc:Ge/Patient/DicomOriginX           = {dicom_origin[0]:.2f} mm",
-            f"dc:Ge/Patient/DicomOriginY           = {dicom_origin[1]:.2f} mm",
-            f"dc:Ge/Patient/DicomOriginZ           = {dicom_origin[2]:.2f} mm",
+        isocenter = layer.isocenter
+        gantry_angle = layer.gantry_angle
+        couch_angle = layer.couch_angle
+        snout_position = layer.snout_position
+        # layers carry no DICOM origin, so it is always written as zero here
+        dicom_origin = _ZERO3
+
+        return (
+            "##############################################\n"
+            "###           V A R I A B L E S            ###\n"
+            "##############################################\n"
             "\n"
-        ]
-        return "\n".join(lines)
+            f"d:Rt/Plan/IsoCenterX                 = {isocenter[0]:.2f} mm\n"
+            f"d:Rt/Plan/IsoCenterY                 = {isocenter[1]:.2f} mm\n"
+            f"d:Rt/Plan/IsoCenterZ                 = {isocenter[2]:.2f} mm\n"
+            f"d:Ge/snoutPosition                   = {snout_position:.2f} mm\n"
+            f"d:Ge/gantryAngle                     = {gantry_angle:.2f} deg\n"
+            f"d:Ge/couchAngle                      = {couch_angle:.2f} deg\n"
+            f"dc:Ge/Patient/DicomOriginX           = {dicom_origin[0]:.2f} mm\n"
+            f"dc:Ge/Patient/DicomOriginY           = {dicom_origin[1]:.2f} mm\n"
+            f"dc:Ge/Patient/DicomOriginZ           = {dicom_origin[2]:.2f} mm\n"
+            "\n"
+        )
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def setup(show_history_interval: int = 100000, nr_threads: int = 0) -> str:
         """
         Generate the TOPAS setup section.
@@ -120,43 +209,30 @@ class TopasText:
 
     @staticmethod
     def world_setup() -> str:
-        lines = [
-            "##############################################",
-            "###         W O R L D    S E T U P         ###",
-            "##############################################",
-            's:Ge/World/Type            = "TsBox"',
-            's:Ge/World/Material        = "Air"',
-            "d:Ge/World/HLX             = 90. cm",
-            "d:Ge/World/HLY             = 90. cm",
-            "d:Ge/World/HLZ             = 90. cm",
-            'b:Ge/World/Invisible       = "True"',
-            "\n"
-        ]
-        return "\n".join(lines)
+        return _WORLD_SETUP
 
     @staticmethod
     def geometry_patient_dicom(rd_path: Path) -> str:
         dicom_dir = str(rd_path.parent)
         rtdose_file = rd_path.name
-        lines = [
-            "##############################################",
-            "###            G E O M E T R Y             ###",
-            "##############################################",
-            's:Ge/Patient/Parent                  = "World"',
-            's:Ge/Patient/Type                    = "TsDicomPatient"',
-            f's:Ge/Patient/DicomDirectory          = "{dicom_dir}"',
-            'sv:Ge/Patient/DicomModalityTags      = 1 "CT"',
-            f's:Ge/Patient/CloneRTDoseGridFrom     = Ge/Patient/DicomDirectory + "/{rtdose_file}"',
-            'd:Ge/Patient/TransX                  = Ge/Patient/DicomOriginX - Rt/Plan/IsoCenterX mm',
-            'd:Ge/Patient/TransY                  = Ge/Patient/DicomOriginY - Rt/Plan/IsoCenterY mm',
-            'd:Ge/Patient/TransZ                  = Ge/Patient/DicomOriginZ - Rt/Plan/IsoCenterZ mm',
-            'd:Ge/Patient/RotX                    = 0.00 deg',
-            'd:Ge/Patient/RotY                    = 0.00 deg',
-            'd:Ge/Patient/RotZ                    = 0.00 deg',
-            's:Ge/Patient/Color                   = "Red"',
+        return (
+            "##############################################\n"
+            "###            G E O M E T R Y             ###\n"
+            "##############################################\n"
+            's:Ge/Patient/Parent                  = "World"\n'
+            's:Ge/Patient/Type                    = "TsDicomPatient"\n'
+            f's:Ge/Patient/DicomDirectory          = "{dicom_dir}"\n'
+            'sv:Ge/Patient/DicomModalityTags      = 1 "CT"\n'
+            f's:Ge/Patient/CloneRTDoseGridFrom     = Ge/Patient/DicomDirectory + "/{rtdose_file}"\n'
+            'd:Ge/Patient/TransX                  = Ge/Patient/DicomOriginX - Rt/Plan/IsoCenterX mm\n'
+            'd:Ge/Patient/TransY                  = Ge/Patient/DicomOriginY - Rt/Plan/IsoCenterY mm\n'
+            'd:Ge/Patient/TransZ                  = Ge/Patient/DicomOriginZ - Rt/Plan/IsoCenterZ mm\n'
+            'd:Ge/Patient/RotX                    = 0.00 deg\n'
+            'd:Ge/Patient/RotY                    = 0.00 deg\n'
+            'd:Ge/Patient/RotZ                    = 0.00 deg\n'
+            's:Ge/Patient/Color                   = "Red"\n'
             "\n"
-        ]
-        return "\n".join(lines)
+        )
 
     @staticmethod
     def geometry_patient(ct: CTModel, rs: RTStruct) -> str:
@@ -181,83 +257,41 @@ class TopasText:
         """
         Generate the geometry section for the water phantom.
         """
-        lines = [
-            "##############################################",
-            "###      G E O M E T R Y   WATERPHANTOM    ###",
-            "##############################################",
-            's:Ge/WaterPhantom/Parent                     = "Patient"',
-            's:Ge/WaterPhantom/Type                       = "TsBox"',
-            's:Ge/WaterPhantom/Material                   = "G4_Water"',
-            f"d:Ge/WaterPhantom/HLX                        = {size:.2f} mm",
-            f"d:Ge/WaterPhantom/HLY                        = {size:.2f} mm",
-            f"d:Ge/WaterPhantom/HLZ                        = {size:.2f} mm",
-            f'd:Ge/WaterPhantom/TransX                     = {0.0:.2f} mm',
-            f'd:Ge/WaterPhantom/TransY                     = {0.0:.2f} mm',
-            f'd:Ge/WaterPhantom/TransZ                     = {0.0:.2f} mm',
-            f'd:Ge/WaterPhantom/RotX                       = {0.0:.2f} deg',
-            f'd:Ge/WaterPhantom/RotY                       = {0.0:.2f} deg',
-            f'd:Ge/WaterPhantom/RotZ                       = {0.0:.2f} deg',
-            f'd:Ge/WaterPhantom/MaxStepSize                = {0.5:.2f} mm',
-            'c:Ge/WaterPhantom/Color                     = "Blue"',
+        return (
+            "##############################################\n"
+            "###      G E O M E T R Y   WATERPHANTOM    ###\n"
+            "##############################################\n"
+            's:Ge/WaterPhantom/Parent                     = "Patient"\n'
+            's:Ge/WaterPhantom/Type                       = "TsBox"\n'
+            's:Ge/WaterPhantom/Material                   = "G4_Water"\n'
+            f"d:Ge/WaterPhantom/HLX                        = {size:.2f} mm\n"
+            f"d:Ge/WaterPhantom/HLY                        = {size:.2f} mm\n"
+            f"d:Ge/WaterPhantom/HLZ                        = {size:.2f} mm\n"
+            'd:Ge/WaterPhantom/TransX                     = 0.00 mm\n'
+            'd:Ge/WaterPhantom/TransY                     = 0.00 mm\n'
+            'd:Ge/WaterPhantom/TransZ                     = 0.00 mm\n'
+            'd:Ge/WaterPhantom/RotX                       = 0.00 deg\n'
+            'd:Ge/WaterPhantom/RotY                       = 0.00 deg\n'
+            'd:Ge/WaterPhantom/RotZ                       = 0.00 deg\n'
+            'd:Ge/WaterPhantom/MaxStepSize                = 0.50 mm\n'
+            'c:Ge/WaterPhantom/Color                     = "Blue"\n'
             "\n"
-        ]
-        return "\n".join(lines)
+        )
 
     @staticmethod
     def geometry_gantry() -> str:
-        lines = [
-            "##############################################",
-            "###     G E O M E T R Y   G A N T R Y      ###",
-            "##############################################",
-            's:Ge/Gantry/Parent                   = "DCM_to_IEC"',
-            's:Ge/Gantry/Type                     = "Group"',
-            "d:Ge/Gantry/TransX                   = 0.00 mm",
-            "d:Ge/Gantry/TransY                   = 0.00 mm",
-            "d:Ge/Gantry/TransZ                   = 0.00 mm",
-            "d:Ge/Gantry/RotX                     = 0.00 deg",
-            "d:Ge/Gantry/RotY                     = Ge/gantryAngle deg",
-            "d:Ge/Gantry/RotZ                     = 0.00 deg",
-            "\n"
-        ]
-        return "\n".join(lines)
+        return _GEOMETRY_GANTRY
 
     @staticmethod
     def geometry_couch() -> str:
-        lines = [
-            "##############################################",
-            "###      G E O M E T R Y    C O U C H      ###",
-            "##############################################",
-            's:Ge/Couch/Parent                  = "World"',
-            's:Ge/Couch/Type                    = "Group"',
-            "d:Ge/Couch/RotX                    = 0. deg",
-            "d:Ge/Couch/RotY                    = -1.0 * Ge/couchAngle deg",
-            "d:Ge/Couch/RotZ                    = 0. deg",
-            "d:Ge/Couch/TransX                  = 0.0 mm",
-            "d:Ge/Couch/TransY                  = 0.0 mm",
-            "d:Ge/Couch/TransZ                  = 0.0 mm",
-            "\n"
-        ]
-        return "\n".join(lines)
+        return _GEOMETRY_COUCH
 
     @staticmethod
     def geometry_dcm_to_iec() -> str:
-        lines = [
-            "##############################################",
-            "###      G E O M E T R Y    DCM_to_IEC     ###",
-            "##############################################",
-            's:Ge/DCM_to_IEC/Parent               = "Couch"',
-            's:Ge/DCM_to_IEC/Type                 = "Group"',
-            "d:Ge/DCM_to_IEC/TransX               = 0.0 mm",
-            "d:Ge/DCM_to_IEC/TransY               = 0.0 mm",
-            "d:Ge/DCM_to_IEC/TransZ               = 0.0 mm",
-            "d:Ge/DCM_to_IEC/RotX                 = 90.00 deg",
-            "d:Ge/DCM_to_IEC/RotY                 = 0.0 deg",
-            "d:Ge/DCM_to_IEC/RotZ                 = 0.0 deg",
-            "\n"
-        ]
-        return "\n".join(lines)
+        return _GEOMETRY_DCM_TO_IEC
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def geometry_beam_position_timefeature(beam_model_position: float = 500.0) -> str:
         lines = [
             "##############################################",
@@ -282,73 +316,50 @@ class TopasText:
 
         rs = myfield.range_shifter
 
-        lines = [
-            "##############################################",
-            "###        R A N G E   S H I F T E R       ###",
-            "##############################################",
-            's:Ge/RangeShifter/Parent             = "Gantry"',
-            's:Ge/RangeShifter/Type               = "TsBox"',
-            f's:Ge/RangeShifter/Material           = "{rs.material}"',
-            'b:Ge/RangeShifter/Isparallel         = "True"',
-            'sv:Ph/Default/LayeredMassGeometryWorlds = 2 "Patient/RTDoseGrid" "RangeShifter"',
-            f"d:Ge/RangeShifter/HLX                = {200:.2f} mm",
-            f"d:Ge/RangeShifter/HLY                = {200:.2f} mm",
-            f"d:Ge/RangeShifter/HLZ                = {rs.thickness*0.5:.2f} mm",
-            's:Ge/RangeShifter/Color              = "Orange"',
+        return (
+            "##############################################\n"
+            "###        R A N G E   S H I F T E R       ###\n"
+            "##############################################\n"
+            's:Ge/RangeShifter/Parent             = "Gantry"\n'
+            's:Ge/RangeShifter/Type               = "TsBox"\n'
+            f's:Ge/RangeShifter/Material           = "{rs.material}"\n'
+            'b:Ge/RangeShifter/Isparallel         = "True"\n'
+            'sv:Ph/Default/LayeredMassGeometryWorlds = 2 "Patient/RTDoseGrid" "RangeShifter"\n'
+            "d:Ge/RangeShifter/HLX                = 200.00 mm\n"
+            "d:Ge/RangeShifter/HLY                = 200.00 mm\n"
+            f"d:Ge/RangeShifter/HLZ                = {rs.thickness*0.5:.2f} mm\n"
+            's:Ge/RangeShifter/Color              = "Orange"\n'
             # TODO: not to center of RS?
-            f'd:Ge/RangeShifter/TransZ            = {-(rs.isocenter_distance+rs.thickness*0.5):.2f} mm\n',
+            f'd:Ge/RangeShifter/TransZ            = {-(rs.isocenter_distance+rs.thickness*0.5):.2f} mm\n\n'
             "\n"
-        ]
-        return "\n".join(lines)
+        )
 
     @staticmethod
     def field_beam_timefeature() -> str:
-        lines = [
-            "##############################################",
-            "###               B  E  A  M               ###",
-            "##############################################",
-            's:So/Field/Type                      = "Emittance"',
-            's:So/Field/Component                 = "BeamPosition"',
-            's:So/Field/BeamParticle              = "proton"',
-            "d:So/Field/BeamEnergy                = Tf/Energy/Value MeV",
-            "u:So/Field/BeamEnergySpread          = Tf/EnergySpread/Value",
-            's:So/Field/Distribution              = "BiGaussian"',
-            "d:So/Field/SigmaX                    = Tf/SigmaX/Value mm",
-            "d:So/Field/SigmaY                    = Tf/SigmaY/Value mm",
-            "u:So/Field/SigmaXprime               = Tf/SigmaXprime/Value",
-            "u:So/Field/SigmaYprime               = Tf/SigmaYprime/Value",
-            "u:So/Field/CorrelationX              = Tf/CorrelationX/Value",
-            "u:So/Field/CorrelationY              = Tf/CorrelationY/Value",
-            "",
-            "i:So/Field/NumberOfHistoriesInRun    = Tf/spotWeight/Value",
-            "\n"
-        ]
-        return "\n".join(lines)
+        return _FIELD_BEAM_TIMEFEATURE
 
     @staticmethod
     def scorer_setup_dicom(dose_to_water: bool = True, topas_output_path: str = "") -> str:
-        lines = [
-            "##############################################",
-            "###       S C O R E R    S E T U P         ###",
-            "##############################################",
-        ]
         if dose_to_water:
-            lines.append(
-                's:Sc/Dose/Quantity                   = "DoseToWater"')
-            lines.append('b:Sc/Dose/PreCalculateStoppingPowerRatios = "True"')
+            quantity = (
+                's:Sc/Dose/Quantity                   = "DoseToWater"\n'
+                'b:Sc/Dose/PreCalculateStoppingPowerRatios = "True"\n'
+            )
         else:
-            lines.append(
-                's:Sc/Dose/Quantity                   = "DoseToMedium"')
-        lines.append(
-            's:Sc/Dose/Component                  = "Patient/RTDoseGrid"')
-        lines.append('s:Sc/Dose/ReferencedDicomPatient     = "Patient"')
-        lines.append('s:Sc/Dose/IfOutputFileAlreadyExists  = "Overwrite"')
-        lines.append('s:Sc/Dose/OutputType                 = "DICOM"')
-        lines.append(
-            f's:Sc/Dose/OutputFile                 = "{topas_output_path}"')
-        lines.append('b:Sc/Dose/DICOMOutput32BitsPerPixel  = "F"')
-        lines.append('\n')
-        return "\n".join(lines)
+            quantity = 's:Sc/Dose/Quantity                   = "DoseToMedium"\n'
+        return (
+            "##############################################\n"
+            "###       S C O R E R    S E T U P         ###\n"
+            "##############################################\n"
+            f"{quantity}"
+            's:Sc/Dose/Component                  = "Patient/RTDoseGrid"\n'
+            's:Sc/Dose/ReferencedDicomPatient     = "Patient"\n'
+            's:Sc/Dose/IfOutputFileAlreadyExists  = "Overwrite"\n'
+            's:Sc/Dose/OutputType                 = "DICOM"\n'
+            f's:Sc/Dose/OutputFile                 = "{topas_output_path}"\n'
+            'b:Sc/Dose/DICOMOutput32BitsPerPixel  = "F"\n'
+            '\n'
+        )
 
     @staticmethod
     def scoring_box_x(size: float = 300.0) -> str:
@@ -360,9 +371,9 @@ class TopasText:
             's:Ge/ScoringXBox/Type       = "TsBox"',
             'b:Ge/ScoringXBox/IsParallel = "TRUE"',
             f's:Ge/ScoringXBox/HLX       = {size:.2f} mm',
-            f's:Ge/ScoringXBox/HLY       = {10.0:.2f} mm',
-            f's:Ge/ScoringXBox/HLZ       = {10.0:.2f} mm',
-            f's:Ge/ScoringXBox/XBins     = {size:d}',
+            's:Ge/ScoringXBox/HLY       = 10.00 mm',
+            's:Ge/ScoringXBox/HLZ       = 10.00 mm',
+            f's:Ge/ScoringXBox/XBins     = {int(size):d}',
             's:Ge/ScoringXBox/YBins     = 1',
             's:Ge/ScoringXBox/ZBins     = 1',
             's:Ge/ScoringXBox/Color      = "green"',
@@ -382,11 +393,11 @@ class TopasText:
             's:Ge/ScoringYBox/Parent     = "World"',
             's:Ge/ScoringYBox/Type       = "TsBox"',
             'b:Ge/ScoringYBox/IsParallel = "TRUE"',
-            f's:Ge/ScoringYBox/HLX       = {10.0:.2f} mm',
+            's:Ge/ScoringYBox/HLX       = 10.00 mm',
             f's:Ge/ScoringYBox/HLY       = {size:.2f} mm',
-            f's:Ge/ScoringYBox/HLZ       = {10.0:.2f} mm',
+            's:Ge/ScoringYBox/HLZ       = 10.00 mm',
             's:Ge/ScoringYBox/XBins     = 1',
-            f's:Ge/ScoringYBox/YBins     = {size:d}',
+            f's:Ge/ScoringYBox/YBins     = {int(size):d}',
             's:Ge/ScoringYBox/ZBins     = 1',
             's:Ge/ScoringYBox/Color      = "green"',
             's:Ge/ScoringYBox/TransX     = 0.0 mm',
@@ -405,12 +416,12 @@ class TopasText:
             's:Ge/ScoringZBox/Parent     = "World"',
             's:Ge/ScoringZBox/Type       = "TsBox"',
             'b:Ge/ScoringZBox/IsParallel = "TRUE"',
-            f's:Ge/ScoringZBox/HLX       = {10.0:.2f} mm',
-            f's:Ge/ScoringZBox/HLY       = {10.0:.2f} mm',
+            's:Ge/ScoringZBox/HLX       = 10.00 mm',
+            's:Ge/ScoringZBox/HLY       = 10.00 mm',
             f's:Ge/ScoringZBox/HLZ       = {size:.2f} mm',
             's:Ge/ScoringZBox/XBins     = 1',
             's:Ge/ScoringZBox/YBins     = 1',
-            f's:Ge/ScoringZBox/ZBins     = {size:d}',
+            f's:Ge/ScoringZBox/ZBins     = {int(size):d}',
             's:Ge/ScoringZBox/Color      = "green"',
             's:Ge/ScoringZBox/TransX     = 0.0 mm',
             's:Ge/ScoringZBox/TransY     = 0.0 mm',
@@ -431,9 +442,9 @@ class TopasText:
             'b:Ge/ScoringXYBox/IsParallel = "TRUE"',
             f's:Ge/ScoringXYBox/HLX       = {size_x:.2f} mm',
             f's:Ge/ScoringXYBox/HLY       = {size_y:.2f} mm',
-            f's:Ge/ScoringXYBox/HLZ       = {10.0:.2f} mm',
-            f's:Ge/ScoringXYBox/XBins     = {size_x:d}',
-            f's:Ge/ScoringXYBox/YBins     = {size_y:d}',
+            's:Ge/ScoringXYBox/HLZ       = 10.00 mm',
+            f's:Ge/ScoringXYBox/XBins     = {int(size_x):d}',
+            f's:Ge/ScoringXYBox/YBins     = {int(size_y):d}',
             's:Ge/ScoringXYBox/ZBins     = 1',
             's:Ge/ScoringXYBox/Color      = "green"',
             's:Ge/ScoringXYBox/TransX     = 0.0 mm',
@@ -453,11 +464,11 @@ class TopasText:
             's:Ge/ScoringXZBox/Type       = "TsBox"',
             'b:Ge/ScoringXZBox/IsParallel = "TRUE"',
             f's:Ge/ScoringXZBox/HLX       = {size_x:.2f} mm',
-            f's:Ge/ScoringXZBox/HLY       = {10.0:.2f} mm',
+            's:Ge/ScoringXZBox/HLY       = 10.00 mm',
             f's:Ge/ScoringXZBox/HLZ       = {size_z:.2f} mm',
-            f's:Ge/ScoringXZBox/XBins     = {size_x:d}',
+            f's:Ge/ScoringXZBox/XBins     = {int(size_x):d}',
             's:Ge/ScoringXZBox/YBins     = 1',
-            f's:Ge/ScoringXZBox/ZBins     = {size_z:d}',
+            f's:Ge/ScoringXZBox/ZBins     = {int(size_z):d}',
             's:Ge/ScoringXZBox/Color      = "green"',
             's:Ge/ScoringXZBox/TransX     = 0.0 mm',
             's:Ge/ScoringXZBox/TransY     = 0.0 mm',
@@ -475,12 +486,12 @@ class TopasText:
             's:Ge/ScoringYZBox/Parent     = "World"',
             's:Ge/ScoringYZBox/Type       = "TsBox"',
             'b:Ge/ScoringYZBox/IsParallel = "TRUE"',
-            f's:Ge/ScoringYZBox/HLX       = {10.0:.2f} mm',
+            's:Ge/ScoringYZBox/HLX       = 10.00 mm',
             f's:Ge/ScoringYZBox/HLY       = {size_y:.2f} mm',
             f's:Ge/ScoringYZBox/HLZ       = {size_z:.2f} mm',
             's:Ge/ScoringYZBox/XBins     = 1',
-            f's:Ge/ScoringYZBox/YBins     = {size_y:d}',
-            f's:Ge/ScoringYZBox/ZBins     = {size_z:d}',
+            f's:Ge/ScoringYZBox/YBins     = {int(size_y):d}',
+            f's:Ge/ScoringYZBox/ZBins     = {int(size_z):d}',
             's:Ge/ScoringYZBox/Color      = "green"',
             's:Ge/ScoringYZBox/TransX     = 0.0 mm',
             's:Ge/ScoringYZBox/TransY     = 0.0 mm',
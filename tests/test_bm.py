@@ -1,3 +1,4 @@
+import os
 import unittest
 import numpy as np
 from pathlib import Path
@@ -9,16 +10,18 @@ beam_models_dir = Path("res") / "beam_models"
 
 class TestBeamModel(unittest.TestCase):
 
-    def setUp(self):
-        beam_model_files = sorted(beam_models_dir.glob("*.csv"))
+    @classmethod
+    def setUpClass(cls):
+        # the beam models are only read, so they are built once for all tests
+        with os.scandir(beam_models_dir) as it:
+            beam_model_files = sorted(Path(e.path) for e in it if e.name.endswith(".csv") and e.is_file())
         if not beam_model_files:
-            self.skipTest("No beam model files found in the directory.")
-        self.beam_models = []
+            raise unittest.SkipTest("No beam model files found in the directory.")
+        cls.beam_models = []
         for path_bm in beam_model_files:
-            if path_bm.is_file():
-                bm = BeamModel(path_bm, nominal=True,
-                               beam_model_position=500.0)
-                self.beam_models.append(bm)
+            bm = BeamModel(path_bm, nominal=True,
+                           beam_model_position=500.0)
+            cls.beam_models.append(bm)
 
     def test_fwhm_calculation(self):
         sigma = 1.0  # Example sigma value
@@ -42,14 +45,15 @@ class TestBeamModel(unittest.TestCase):
                     self.assertTrue(callable(interpolator),
                                     f"{attr} is not callable.")
 
-                # Sanity test a typical interpolation value
-                test_energy = 150.0  # MeV
-                sx_val = bm.f_sx(test_energy)
-                sy_val = bm.f_sy(test_energy)
-                e_val = bm.f_e(test_energy)
-                self.assertTrue(0.0 < sx_val < 20.0,
-                                f"f_sx returned unrealistic value: {sx_val}")
-                self.assertTrue(0.0 < sy_val < 20.0,
-                                f"f_sy returned unrealistic value: {sy_val}")
-                self.assertTrue(70.0 < e_val < 230.0,
-                                f"f_e returned unrealistic value: {e_val}")
+                # Sanity test typical interpolation values, evaluated in one call per interpolator
+                test_energies = np.array([80.0, 150.0, 220.0])  # MeV
+                sx_val = bm.f_sx(test_energies)
+                sy_val = bm.f_sy(test_energies)
+                e_val = bm.f_e(test_energies)
+                self.assertEqual(sx_val.shape, test_energies.shape)
+                self.assertTrue(np.all((0.0 < sx_val) & (sx_val < 20.0)),
+                                f"f_sx returned unrealistic values: {sx_val}")
+                self.assertTrue(np.all((0.0 < sy_val) & (sy_val < 20.0)),
+                                f"f_sy returned unrealistic values: {sy_val}")
+                self.assertTrue(np.all((70.0 < e_val) & (e_val < 230.0)),
+                                f"f_e returned unrealistic values: {e_val}")
@@ -1,51 +1,60 @@
+import contextlib
+import re
+import tempfile
 import unittest
-import sys
 from pathlib import Path
 from io import StringIO
 
 import dicomexport.main_plan_export as main_plan_export
 
+# Match versions like 0.0.post2+g3e1d4d2
+VERSION_RE = re.compile(r"\d+\.\d+(\.\d+)?([a-z0-9\.\+\-]+)?")
+
 
 class TestPregdosCLI(unittest.TestCase):
 
+    def setUp(self):
+        # each test writes its plan file into its own temporary directory
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+
     def test_help_flag(self):
         """Test that -h returns help message without error."""
-        saved_stdout = sys.stdout
-        try:
-            sys.stdout = StringIO()
-            with self.assertRaises(SystemExit) as cm:
-                main_plan_export.main(["-h"])
-            output = sys.stdout.getvalue()
-            self.assertIn("usage", output.lower())
-            self.assertEqual(cm.exception.code, 0)
-        finally:
-            sys.stdout = saved_stdout
+        buf = StringIO()
+        with contextlib.redirect_stdout(buf), self.assertRaises(SystemExit) as cm:
+            main_plan_export.main(["-h"])
+        output = buf.getvalue()
+        self.assertIn("usage", output.lower())
+        self.assertEqual(cm.exception.code, 0)
 
     def test_version_flag(self):
         """Test that -V returns version string without error."""
-        saved_stdout = sys.stdout
-        try:
-            sys.stdout = StringIO()
-            with self.assertRaises(SystemExit) as cm:
-                main_plan_export.main(["-V"])
-            output = sys.stdout.getvalue()
-            # Match versions like 0.0.post2+g3e1d4d2
-            self.assertRegex(output, r"\d+\.\d+(\.\d+)?([a-z0-9\.\+\-]+)?")
-            self.assertEqual(cm.exception.code, 0)
-        finally:
-            sys.stdout = saved_stdout
-
-    def _run_conversion_test(self, dicom_file_name: str):
+        buf = StringIO()
+        with contextlib.redirect_stdout(buf), self.assertRaises(SystemExit) as cm:
+            main_plan_export.main(["-V"])
+        output = buf.getvalue()
+        self.assertRegex(output, VERSION_RE)
+        self.assertEqual(cm.exception.code, 0)
+
+    def test_negative_jobs(self):
+        """Test that a negative -j is rejected with a usage error."""
+        buf = StringIO()
+        with contextlib.redirect_stderr(buf), self.assertRaises(SystemExit) as cm:
+            main_plan_export.main(["-j", "-2", "res/test_plans/temp_160MeV_10x10.dcm"])
+        self.assertIn("must be 0 or a positive integer", buf.getvalue())
+        self.assertEqual(cm.exception.code, 2)
+
+    def _run_conversion_test(self, dicom_file_name: str, verbosity: str = "-v"):
         """Helper to run CLI on a given DICOM file and check output."""
-        test_output_file = Path("plan_field01.txt")
-        if test_output_file.exists():
-            test_output_file.unlink()
+        test_output_file = self.tmpdir / "plan_field01.txt"
 
         test_args = [
             "-f1",
-            "-vv",
+            verbosity,
             "-b=res/beam_models/DCPT_beam_model__v2.csv",
-            f"res/test_plans/{dicom_file_name}"
+            f"res/test_plans/{dicom_file_name}",
+            f"{self.tmpdir / 'plan.txt'}"
         ]
 
         retcode = main_plan_export.main(test_args)
@@ -57,9 +66,6 @@ class TestPregdosCLI(unittest.TestCase):
         self.assertGreater(test_output_file.stat().st_size,
                            0, f"Output file is empty for {dicom_file_name}.")
 
-        # Clean up
-        test_output_file.unlink()
-
     def test_conversion_temp_160MeV(self):
         """Run CLI conversion on monoenergetic 160 MeV DICOM input."""
         self._run_conversion_test("temp_160MeV_10x10.dcm")
@@ -68,6 +74,10 @@ class TestPregdosCLI(unittest.TestCase):
         """Run CLI conversion on SOBP DICOM input."""
         self._run_conversion_test("temp_sobp_10x10.dcm")
 
+    def test_debug_conversion_temp_sobp(self):
+        """Run CLI conversion on SOBP DICOM input with debug logging enabled."""
+        self._run_conversion_test("temp_sobp_10x10.dcm", verbosity="-vv")
+
 
 if __name__ == "__main__":
     unittest.main()
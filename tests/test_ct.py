@@ -1,7 +1,7 @@
 import unittest
 from pathlib import Path
 
-from dicomexport.model_ct import CTModel
+from dicomexport.model_ct import CTModel, Image
 from dicomexport.import_ct import load_ct
 
 # path to test CT file
@@ -24,6 +24,33 @@ class TestCT(unittest.TestCase):
         self.assertIsNotNone(ct.images)
         self.assertIsNotNone(ct.patient_id)
         self.assertIsNotNone(ct.patient_name)
+        self.assertGreater(ct.slice_thickness, 0.0)
+
+    def test_ct_load_parallel(self):
+        # reading the slices in worker processes must give the same model as the serial default
+        ct_serial = load_ct(CT_TEST_PATH)
+        ct_parallel = load_ct(CT_TEST_PATH, workers=2)
+        # Image equality skips the geometry arrays, so whole image lists can be compared
+        self.assertEqual(ct_parallel.images, ct_serial.images)
+        self.assertEqual(ct_parallel.slice_thickness, ct_serial.slice_thickness)
+
+    def test_ct_header_cache(self):
+        ct = load_ct(CT_TEST_PATH)
+        self.assertGreater(ct.slice_thickness, 0.0)
+        self.assertEqual(ct.rows, ct.images[0].rows)
+
+        # a new image list drops the header cached by load_ct
+        ct.images = [Image(slice_position=z, rows=4) for z in (0.0, 5.0)]
+        self.assertEqual(ct.slice_thickness, 5.0)
+        self.assertEqual(ct.rows, 4)
+        ct.images = []
+        self.assertEqual(ct.slice_thickness, 0.0)
+        self.assertEqual(ct.rows, 0)
+
+    def test_ct_slice_thickness_unsorted(self):
+        # the spacing does not depend on the order of the images, and tolerates a single odd gap
+        ct = CTModel(images=[Image(slice_position=z) for z in (4.0, 0.0, 2.0, 6.0, 9.0)])
+        self.assertAlmostEqual(ct.slice_thickness, 2.0)
 
 
 if __name__ == '__main__':
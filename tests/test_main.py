@@ -1,5 +1,7 @@
+import contextlib
+import re
+import tempfile
 import unittest
-import sys
 from pathlib import Path
 from io import StringIO
 
@@ -9,54 +11,49 @@ DICOM_TEST_DIR = Path("res/test_studies/DCPT_headphantom/")
 BEAM_MODEL_PATH = Path("res/beam_models/DCPT_beam_model__v2.csv")
 SPR_TABLE_PATH = Path("res/spr_tables/SPRtoMaterial__Brain.txt")
 
+# Match versions like 0.0.post2+g3e1d4d2
+VERSION_RE = re.compile(r"\d+\.\d+(\.\d+)?([a-z0-9\.\+\-]+)?")
+
 
 class TestPregdosCLI(unittest.TestCase):
 
+    def setUp(self):
+        # each test writes its field files into its own temporary directory
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.output_base_path = Path(tmpdir.name) / "topas.txt"
+        self.test_output_files = [
+            Path(tmpdir.name) / f"topas_field{i:02d}.txt" for i in range(1, 4)
+        ]
+
     def test_help_flag(self):
         """Test that -h returns help message without error."""
-        saved_stdout = sys.stdout
-        try:
-            sys.stdout = StringIO()
-            with self.assertRaises(SystemExit) as cm:
-                study.main(["-h"])
-            output = sys.stdout.getvalue()
-            self.assertIn("usage", output.lower())
-            self.assertEqual(cm.exception.code, 0)
-        finally:
-            sys.stdout = saved_stdout
+        buf = StringIO()
+        with contextlib.redirect_stdout(buf), self.assertRaises(SystemExit) as cm:
+            study.main(["-h"])
+        output = buf.getvalue()
+        self.assertIn("usage", output.lower())
+        self.assertEqual(cm.exception.code, 0)
 
     def test_version_flag(self):
         """Test that -V returns version string without error."""
-        saved_stdout = sys.stdout
-        try:
-            sys.stdout = StringIO()
-            with self.assertRaises(SystemExit) as cm:
-                study.main(["-V"])
-            output = sys.stdout.getvalue()
-            # Match versions like 0.0.post2+g3e1d4d2
-            self.assertRegex(output, r"\d+\.\d+(\.\d+)?([a-z0-9\.\+\-]+)?")
-            self.assertEqual(cm.exception.code, 0)
-        finally:
-            sys.stdout = saved_stdout
+        buf = StringIO()
+        with contextlib.redirect_stdout(buf), self.assertRaises(SystemExit) as cm:
+            study.main(["-V"])
+        output = buf.getvalue()
+        self.assertRegex(output, VERSION_RE)
+        self.assertEqual(cm.exception.code, 0)
 
     def test_main(self):
         """Helper to run CLI on a given DICOM file and check output."""
 
-        test_output_files = [
-            Path(f"topas_field{i:02d}.txt") for i in range(1, 4)
-        ]
-
-        # Clean up any existing output files
-        for test_output_file in test_output_files:
-            if test_output_file.exists():
-                test_output_file.unlink()
-
         test_args = [
             "-vv",
             "-p 500.0",
             f"-b={BEAM_MODEL_PATH}",
             f"-s={SPR_TABLE_PATH}",
-            f"{DICOM_TEST_DIR}"
+            f"{DICOM_TEST_DIR}",
+            f"{self.output_base_path}"
         ]
 
         retcode = study.main(test_args)
@@ -64,36 +61,24 @@ class TestPregdosCLI(unittest.TestCase):
             retcode, 0, f"CLI execution failed for {DICOM_TEST_DIR}")
 
         # check if all output files were created and are not empty:
-        for test_output_file in test_output_files:
+        for test_output_file in self.test_output_files:
             self.assertTrue(test_output_file.exists(),
                             f"Output file was not created for {DICOM_TEST_DIR}.")
             self.assertGreater(test_output_file.stat().st_size,
                                0, f"Output file is empty for {DICOM_TEST_DIR}.")
 
-        # Clean up
-        for test_output_file in test_output_files:
-            test_output_file.unlink()
-
     # test for -N nstat parameter
     def test_nstat_parameter(self):
         """Test that the -N parameter correctly sets the nstat value in the output files."""
 
-        test_output_files = [
-            Path(f"topas_field{i:02d}.txt") for i in range(1, 4)
-        ]
-
-        # Clean up any existing output files
-        for test_output_file in test_output_files:
-            if test_output_file.exists():
-                test_output_file.unlink()
-
         nstat_value = int(2e6)  # double of the default value
         test_args = [
-            "-vv",
+            "-v",
             f"-N={nstat_value}",
             f"-b={BEAM_MODEL_PATH}",
             f"-s={SPR_TABLE_PATH}",
-            f"{DICOM_TEST_DIR}"
+            f"{DICOM_TEST_DIR}",
+            f"{self.output_base_path}"
         ]
 
         retcode = study.main(test_args)
@@ -101,7 +86,7 @@ class TestPregdosCLI(unittest.TestCase):
             retcode, 0, f"CLI execution failed for {DICOM_TEST_DIR} with -N parameter.")
 
         # check if all output files were created and contain the correct nstat value:
-        for test_output_file in test_output_files:
+        for test_output_file in self.test_output_files:
             self.assertTrue(test_output_file.exists(),
                             f"Output file was not created for {DICOM_TEST_DIR} with -N parameter.")
             with open(test_output_file, 'r') as f:
@@ -109,14 +94,26 @@ class TestPregdosCLI(unittest.TestCase):
                 self.assertIn(f"# REQUESTED_HISTORIES: {nstat_value}", content,
                               f"nStat value not found or incorrect in {test_output_file}.")
 
-    def tearDown(self):
-        """Clean up any created files after each test."""
-        test_output_files = [
-            Path(f"topas_field{i:02d}.txt") for i in range(1, 4)
+    def test_parallel_export(self):
+        """Test that exporting fields with several worker processes writes all field files."""
+
+        test_args = [
+            "-j2",
+            f"-b={BEAM_MODEL_PATH}",
+            f"-s={SPR_TABLE_PATH}",
+            f"{DICOM_TEST_DIR}",
+            f"{self.output_base_path}"
         ]
-        for test_output_file in test_output_files:
-            if test_output_file.exists():
-                test_output_file.unlink()
+
+        retcode = study.main(test_args)
+        self.assertEqual(
+            retcode, 0, f"CLI execution failed for {DICOM_TEST_DIR} with -j parameter.")
+
+        for test_output_file in self.test_output_files:
+            self.assertTrue(test_output_file.exists(),
+                            f"Output file was not created for {DICOM_TEST_DIR} with -j parameter.")
+            self.assertGreater(test_output_file.stat().st_size,
+                               0, f"Output file is empty for {DICOM_TEST_DIR} with -j parameter.")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,10 @@
 import unittest
-from dicomexport.model_plan import Plan
+from pathlib import Path
+
+from dicomexport.beam_model import BeamModel
+from dicomexport.model_plan import Plan, Field, Layer, Spot
+
+BEAM_MODEL_PATH = Path("res") / "beam_models" / "DCPT_beam_model__v2.csv"
 
 
 class TestPlan(unittest.TestCase):
@@ -14,6 +19,42 @@ class TestPlan(unittest.TestCase):
         self.assertIsInstance(p.fields, list)
         self.assertEqual(len(p.fields), 0)
 
+    def test_layer_spots_init(self):
+        layer = Layer([Spot(1.0, 2.0, 3.0)], energy_nominal=150.0)
+        self.assertEqual(Layer(spots=[Spot(1.0, 2.0, 3.0)]).spots_array.tolist(), layer.spots_array.tolist())
+        self.assertEqual(layer.n_spots, 1)
+        self.assertEqual(layer.spots, [Spot(1.0, 2.0, 3.0)])
+        # the spots property is a copy, changing it leaves the layer untouched
+        layer.spots.append(Spot(4.0, 5.0, 6.0))
+        self.assertEqual(layer.n_spots, 1)
+        self.assertEqual(Layer().n_spots, 0)
+
+    def test_apply_beammodel_layer_mu_from_spots(self):
+        # a rounded layer MU from the plan file is replaced by the sum of the spots, with a warning
+        layer = Layer(spots=[Spot(0.0, 0.0, 4.5), Spot(1.0, 0.0, 4.5)], energy_nominal=150.0, cum_mu=10.0)
+        p = Plan(fields=[Field(layers=[layer])])
+        p.beam_model = BeamModel(BEAM_MODEL_PATH)
+        with self.assertLogs("dicomexport.model_plan", level="WARNING"):
+            p.apply_beammodel()
+        self.assertEqual(layer.cum_mu, 9.0)
+        self.assertEqual(p.fields[0].cum_mu, 9.0)
+
+    def test_field_stats_follow_layer_changes(self):
+        layer = Layer(spots=[Spot(0.0, 0.0, 1.0), Spot(2.0, -1.0, 1.0)], energy_nominal=150.0)
+        p = Plan(fields=[Field(layers=[layer])])
+        p.beam_model = BeamModel(BEAM_MODEL_PATH)
+        p.apply_beammodel()
+        myfield = p.fields[0]
+        self.assertEqual((myfield.n_spots, myfield.xmax, myfield.emax), (2, 2.0, 150.0))
+
+        # the aggregates are computed from the layers on access, so they follow later changes
+        layer.spots = [Spot(5.0, 0.0, 1.0)]
+        myfield.layers.append(Layer(spots=[Spot(-3.0, 4.0, 1.0)], energy_nominal=160.0))
+        self.assertEqual(myfield.n_spots, 2)
+        self.assertEqual((myfield.xmin, myfield.xmax), (-3.0, 5.0))
+        self.assertEqual(myfield.ymax, 4.0)
+        self.assertEqual((myfield.emin, myfield.emax), (150.0, 160.0))
+
 
 if __name__ == '__main__':
     unittest.main()
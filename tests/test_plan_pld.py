@@ -0,0 +1,97 @@
+import contextlib
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+
+import dicomexport.main_plan_export as main_plan_export
+from dicomexport.import_plan_pld import load_plan_header_pld, load_plan_pld
+
+# two layers, the second one holds a spot below eps in x/y and a spot without MU
+PLD_TEST_DATA = """\
+Beam,P123,Doe,JD,John,PlanA,Beam1,100.0,100.0,2
+Layer,3.0,150.0,60.0,3,1
+Element,1.0,2.0,20.0
+Element,-1.0,2.0,20.0
+Element,0.0,0.0,20.0
+Layer,3.0,140.0,40.0,3,0
+Element,1e-12,-1e-12,25.0
+Element,-1.0,2.0,15.0
+Element,5.0,5.0,0.0
+"""
+
+
+class TestPlanPLD(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+
+    def _write_pld(self, text: str) -> Path:
+        path = self.tmpdir / "plan.pld"
+        path.write_text(text)
+        return path
+
+    def test_pld_header(self):
+        pln = load_plan_pld(self._write_pld(PLD_TEST_DATA))
+        self.assertEqual(pln.patient_id, "P123")
+        self.assertEqual(pln.patient_name, "Doe")
+        self.assertEqual(pln.patient_initials, "JD")
+        self.assertEqual(pln.patient_firstname, "John")
+        self.assertEqual(pln.plan_label, "PlanA")
+        self.assertEqual(pln.beam_name, "Beam1")
+        self.assertEqual(pln.n_fields, 1)
+        self.assertEqual(pln.fields[0].cum_mu, 100.0)
+
+    def test_pld_header_only(self):
+        pln = load_plan_header_pld(self._write_pld(PLD_TEST_DATA))
+        self.assertEqual(pln.patient_id, "P123")
+        self.assertEqual(pln.beam_name, "Beam1")
+        self.assertEqual(pln.n_fields, 1)
+        self.assertEqual(pln.fields[0].cum_mu, 100.0)
+        self.assertEqual(pln.fields[0].n_layers, 0)
+
+    def test_pld_diag(self):
+        # the Element lines are not parsed for diagnostics, so a broken one does not matter
+        path = self._write_pld(PLD_TEST_DATA.replace("Element,1.0,2.0,20.0", "Element,broken"))
+        buf = StringIO()
+        with contextlib.redirect_stdout(buf):
+            retcode = main_plan_export.main(["-d", str(path)])
+        self.assertEqual(retcode, 0)
+        self.assertIn("P123", buf.getvalue())
+
+    def test_pld_layers(self):
+        myfield = load_plan_pld(self._write_pld(PLD_TEST_DATA)).fields[0]
+        self.assertEqual(myfield.n_layers, 2)
+        self.assertEqual([layer.energy_nominal for layer in myfield.layers], [150.0, 140.0])
+        self.assertEqual([layer.cum_mu for layer in myfield.layers], [60.0, 40.0])
+        self.assertEqual([layer.repaint for layer in myfield.layers], [1, 0])
+
+        first = myfield.layers[0]
+        np.testing.assert_array_equal(first.x, [1.0, -1.0, 0.0])
+        np.testing.assert_array_equal(first.y, [2.0, 2.0, 0.0])
+        np.testing.assert_array_equal(first.mu, [20.0, 20.0, 20.0])
+        np.testing.assert_allclose(first.size_x, 3.0 * 2.354820045)
+
+    def test_pld_eps_and_empty_spots(self):
+        with self.assertLogs("dicomexport.import_plan_pld", level="WARNING") as cm:
+            myfield = load_plan_pld(self._write_pld(PLD_TEST_DATA)).fields[0]
+        second = myfield.layers[1]
+        # coordinates below eps are set to zero, the spot without MU is dropped
+        np.testing.assert_array_equal(second.x, [0.0, -1.0])
+        np.testing.assert_array_equal(second.y, [0.0, 2.0])
+        np.testing.assert_array_equal(second.mu, [25.0, 15.0])
+        self.assertTrue(any("Expected 3 spots, but found 2" in msg for msg in cm.output))
+
+    def test_pld_layer_count_mismatch(self):
+        text = PLD_TEST_DATA.replace("100.0,100.0,2", "100.0,100.0,3", 1)
+        with self.assertLogs("dicomexport.import_plan_pld", level="WARNING") as cm:
+            load_plan_pld(self._write_pld(text))
+        self.assertTrue(any("Expected 3 layers, but found 2" in msg for msg in cm.output))
+
+
+if __name__ == '__main__':
+    unittest.main()